@@ -138,8 +138,6 @@ count_P = protein_seq.count('P')
 count_Y = protein_seq.count('Y')
 count_V = protein_seq.count('V')
 
-gc_percent = ((count_C + count_G)/ length) * 100
-
 print(f"The length of protein sequnce is {length}")
 print(f"The total no. of A of protein sequnce is {count_A}")
 print(f"The total no. of T of protein sequnce is {count_T}")
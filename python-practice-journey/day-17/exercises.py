@@ -81,12 +81,10 @@ print("gene_list.txt created successfully!")
 ################# TASK 2: Process genes and create selected_genes.txt #################
 print("\n--- TASK 2: Processing genes ---")
 
-# Clear the output file first (if it exists from previous runs)
-with open('selected_genes.txt', 'w') as f:
-    f.write('')  # Clear file
-
 # Read, process, and write selected genes
-with open('gene_list.txt', 'r') as f:
+# Open the output once in 'w' mode: it clears old runs and avoids
+# reopening the file for every selected gene
+with open('gene_list.txt', 'r') as f, open('selected_genes.txt', 'w') as output:
     for line in f:
         # Remove whitespace and convert to uppercase
         clean = line.strip().upper()
@@ -94,8 +92,7 @@ with open('gene_list.txt', 'r') as f:
         
         # Write genes starting with 'A' or 'T'
         if clean.startswith('A') or clean.startswith('T'):
-            with open('selected_genes.txt', 'a') as output:
-                output.write(f"{clean}\n")
+            output.write(f"{clean}\n")
 
 print("\n--- Reading selected_genes.txt ---")
 with open('selected_genes.txt', 'r') as f:
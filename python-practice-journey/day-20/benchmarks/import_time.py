@@ -0,0 +1,94 @@
+"""
+Import-time benchmark for gene_toolkit.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter
+for the package and each submodule, and records the cumulative import
+cost reported for that module (plus everything it pulled in).
+
+Usage:
+    python benchmarks/import_time.py                 # print a table
+    python benchmarks/import_time.py --json out.json # also save results
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(HERE)
+
+MODULES = [
+    "gene_toolkit",
+    "gene_toolkit.io.readers",
+    "gene_toolkit.io.indexed",
+    "gene_toolkit.io.writers",
+    "gene_toolkit.io.compression",
+    "gene_toolkit.utils.validators",
+    "gene_toolkit.utils.parallel",
+    "gene_toolkit.core.sequence",
+    "gene_toolkit.core.analysis",
+    "gene_toolkit.core.packed",
+    "gene_toolkit.analysis.gc_analysis",
+    "gene_toolkit.analysis.motif_finder",
+    "gene_toolkit.analysis.kmers",
+]
+
+
+def import_cost(module, repeats=5):
+    """
+    Measure the cumulative import time of one module in microseconds.
+
+    Each run uses a new interpreter so nothing is cached in sys.modules;
+    the fastest of several runs is kept to reduce noise.
+
+    Args:
+        module (str): Dotted module name
+        repeats (int): Fresh interpreters to try (default: 5)
+
+    Returns:
+        dict: module, cumulative_us (its own line) and total_us (every
+            import in that interpreter, including Python startup modules)
+    """
+    best = None
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_DIR, capture_output=True, text=True, check=True,
+        )
+        cumulative = total = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            fields = line[len("import time:"):].split("|")
+            try:
+                self_us, cumulative_us = int(fields[0]), int(fields[1])
+            except ValueError:
+                continue    # header line
+            total += self_us
+            if fields[2].strip() == module:
+                cumulative = cumulative_us
+        if best is None or cumulative < best["cumulative_us"]:
+            best = {"module": module, "cumulative_us": cumulative, "total_us": total}
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    results = [import_cost(module, args.repeats) for module in MODULES]
+    print(f"{'module':40} {'cumulative ms':>14} {'all imports ms':>15}")
+    for row in results:
+        print(f"{row['module']:40} {row['cumulative_us'] / 1000:14.1f} {row['total_us'] / 1000:15.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -119,23 +119,30 @@ from .analysis import analyze_gc_content, find_motifs
 __version__ = "2.0.0"
 
 # gene_analyzer/io/__init__.py
-from .fasta import read_fasta
+from .fasta import read_fasta, iter_fasta
 from .csv_handler import write_csv
 
 # gene_analyzer/io/fasta.py
-def read_fasta(filename):
-    '''Read FASTA file'''
-    sequences = {}
+def iter_fasta(filename):
+    '''Yield (id, description, sequence) one record at a time'''
     with open(filename, 'r') as f:
-        current_id = None
+        header = None
+        lines = []          # join once per record, not += per line
         for line in f:
             line = line.strip()
             if line.startswith('>'):
-                current_id = line[1:]
-                sequences[current_id] = ""
-            else:
-                sequences[current_id] += line
-    return sequences
+                if header is not None:
+                    yield header.split()[0], header, ''.join(lines)
+                header = line[1:]
+                lines = []
+            elif header is not None:
+                lines.append(line)
+        if header is not None:
+            yield header.split()[0], header, ''.join(lines)
+
+def read_fasta(filename):
+    '''Read FASTA file into a dict (thin wrapper over iter_fasta)'''
+    return {header: seq for _, header, seq in iter_fasta(filename)}
 
 # gene_analyzer/analysis/__init__.py
 from .gc_analysis import analyze_gc_content
@@ -155,11 +162,11 @@ def analyze_gc_content(sequence):
     return ((g_count + c_count) / len(sequence)) * 100
 
 # Usage with absolute imports:
-from gene_analyzer.io import read_fasta
+from gene_analyzer.io import iter_fasta
 from gene_analyzer.analysis import analyze_gc_content
 
-sequences = read_fasta('data.fasta')
-for seq_id, seq in sequences.items():
+# Streaming: work starts on the first record, memory stays per-record
+for seq_id, header, seq in iter_fasta('data.fasta'):
     gc = analyze_gc_content(seq)
     print(f"{seq_id}: {gc:.2f}% GC")
 """)
@@ -0,0 +1,17 @@
+"""Gene Toolkit - Bioinformatics analysis package"""
+
+from ._lazy import lazy_exports
+
+__version__ = "1.0.0"
+
+# Exports are imported on first use (PEP 562) so that short-lived
+# commands only pay for the submodules (and numpy) they actually touch
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    '.core.sequence': ['reverse_complement', 'reverse_complement_batch', 'translate',
+                       'translate_six_frames', 'find_orfs'],
+    '.core.packed': ['PackedSequence'],
+    '.core.analysis': ['gc_content', 'gc_content_batch', 'calculate_tm', 'calculate_tm_batch'],
+    '.io.readers': ['read_fasta', 'iter_fasta', 'iter_fastq'],
+    '.io.writers': ['write_fasta', 'write_fastq'],
+    '.io.indexed': ['IndexedFasta'],
+})
@@ -0,0 +1,42 @@
+"""PEP 562 lazy exports for package __init__ modules"""
+
+import importlib
+import sys
+
+
+def lazy_exports(package_name, exports):
+    """
+    Build module-level __getattr__, __dir__ and __all__ for lazy exports.
+
+    Nothing is imported until an exported name is first accessed; the
+    value is then cached in the package namespace so later lookups are
+    plain attribute hits.
+
+    Args:
+        package_name (str): __name__ of the package
+        exports (dict): Relative submodule ('.sequence') mapped to the
+            list of names it provides
+
+    Returns:
+        tuple: (__getattr__, __dir__, __all__)
+
+    Usage:
+        __getattr__, __dir__, __all__ = lazy_exports(__name__, {
+            '.readers': ['read_fasta'],
+        })
+    """
+    origins = {name: submodule for submodule, names in exports.items() for name in names}
+
+    def __getattr__(name):
+        try:
+            submodule = origins[name]
+        except KeyError:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}") from None
+        value = getattr(importlib.import_module(submodule, package_name), name)
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package_name])) | set(origins))
+
+    return __getattr__, __dir__, list(origins)
@@ -0,0 +1,20 @@
+"""Genome-scale analysis engines"""
+
+from .._lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    '.gc_analysis': ['gc_windows', 'iter_gc_windows'],
+    '.motif_finder': ['MotifAutomaton', 'MotifHit', 'expand_motif', 'find_motifs'],
+    '.pwm': ['PWM', 'PWMHit', 'read_jaspar', 'scan_pwms', 'one_hot'],
+    '.protein': ['AMINO_ACIDS', 'composition_matrix', 'protein_properties',
+                 'proteome_properties', 'isoelectric_points'],
+    '.composition': ['nucleotide_composition'],
+    '.cpg': ['CpGIsland', 'cpg_islands', 'iter_cpg_islands', 'genome_cpg_islands',
+             'cpg_annotations', 'write_cpg_bed'],
+    '.sketch': ['MinHash', 'hash_kmers', 'sketch_fasta', 'compare_sketches',
+                'jaccard_ani', 'containment_ani'],
+    '.align': ['Alignment', 'align', 'align_batch', 'scoring_matrix'],
+    '.fm_index': ['FMIndex', 'suffix_array'],
+    '.quality': ['QualityStats', 'fastq_quality_stats'],
+    '.kmers': ['KmerCounter', 'kmer_array', 'encode_kmer', 'decode_kmer', 'merge_counts'],
+})
@@ -0,0 +1,270 @@
+"""Vectorized Smith-Waterman / Needleman-Wunsch alignment with affine gaps"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from ..core.genetic_code import BASE_CODES
+from ..utils.encoding import as_buffer, as_uint8
+
+Alignment = namedtuple('Alignment', ['score', 'query_start', 'query_end', 'target_start',
+                                     'target_end', 'cigar', 'query_aligned', 'target_aligned'])
+
+# Padding code for batch columns past the end of a query
+_PAD = 5
+
+
+def scoring_matrix(match=2, mismatch=-3, n_score=None):
+    """
+    Build a nucleotide substitution matrix over the BASE_CODES alphabet.
+
+    Args:
+        match (int): Score for identical A/C/G/T bases (default: 2)
+        mismatch (int): Score for different bases (default: -3)
+        n_score (int): Score for any pair involving N or another non-ACGT
+            base (default: mismatch)
+
+    Returns:
+        numpy.ndarray: (5, 5) int matrix indexed by base codes
+    """
+    matrix = np.full((5, 5), mismatch, dtype=np.int64)
+    np.fill_diagonal(matrix[:4, :4], match)
+    matrix[4, :] = matrix[:, 4] = mismatch if n_score is None else n_score
+    return matrix
+
+
+def _score_dtype(matrix, gap_open, gap_extend, rows, cols):
+    """Smallest integer type that holds every DP value, and its 'minus infinity'."""
+    bound = (int(np.abs(matrix).max()) + gap_open + gap_extend) * (rows + cols + 2)
+    if bound < 1 << 13:
+        return np.int16, -(1 << 14)
+    if bound < 1 << 29:
+        return np.int32, -(1 << 30)
+    return np.int64, -(1 << 62)
+
+
+def _fill(row_codes, col_codes, matrix, gap_open, gap_extend, local, keep=False):
+    """
+    Affine-gap DP, one row at a time, vectorized over columns and a batch.
+
+    Each row is computed without horizontal gaps first (diagonal and
+    vertical moves only); horizontal gaps are then added with a single
+    prefix-max scan over H + j * gap_extend, which is exact as long as
+    gap_open >= gap_extend. col_codes is a (batch, n) array sharing the
+    same row sequence, and the per-column scores for each row base come
+    from a precomputed profile.
+
+    Returns:
+        tuple: (best, best_row, best_col, last_row, matrices) where best
+            values are per batch entry (local mode) and matrices holds the
+            (H, E, F) arrays when keep is True
+    """
+    batch, n = col_codes.shape
+    m = len(row_codes)
+    dtype, neg = _score_dtype(matrix, gap_open, gap_extend, m, n)
+    padded = np.full((6, 6), neg // 2, dtype=np.int64)
+    padded[:5, :5] = matrix
+    profile = padded[:, col_codes].astype(dtype)
+
+    steps = (np.arange(n + 1) * gap_extend).astype(dtype)
+    h = np.zeros((batch, n + 1), dtype=dtype)
+    f = np.full((batch, n + 1), neg, dtype=dtype)
+    e = np.full((batch, n + 1), neg, dtype=dtype)
+    if not local:
+        h[:, 1:] = -(gap_open + steps[:-1])
+        e[:, 1:] = h[:, 1:]
+    matrices = None
+    if keep:
+        matrices = [np.empty((m + 1, batch, n + 1), dtype=dtype) for _ in range(3)]
+        for matrix_, row in zip(matrices, (h, e, f)):
+            matrix_[0] = row
+    best = np.zeros(batch, dtype=dtype)
+    best_row = np.zeros(batch, dtype=np.int64)
+    best_col = np.zeros(batch, dtype=np.int64)
+
+    for i in range(1, m + 1):
+        diagonal = h[:, :-1] + profile[row_codes[i - 1]]
+        f = np.maximum(h - gap_open, f - gap_extend)
+        h = np.empty_like(h)
+        h[:, 0] = 0 if local else -(gap_open + (i - 1) * gap_extend)
+        np.maximum(diagonal, f[:, 1:], out=h[:, 1:])
+        if local:
+            np.maximum(h, 0, out=h)
+        else:
+            f[:, 0] = h[:, 0]
+
+        # E[j] = max over k < j of H[k] - gap_open - (j - 1 - k) * gap_extend
+        running = np.maximum.accumulate(h + steps, axis=1)
+        e = np.empty_like(h)
+        e[:, 0] = neg
+        e[:, 1:] = running[:, :-1] - steps[:-1] - gap_open
+        np.maximum(h, e, out=h)
+
+        if keep:
+            for matrix_, row in zip(matrices, (h, e, f)):
+                matrix_[i] = row
+        if local:
+            columns = h.argmax(axis=1)
+            scores = h[np.arange(batch), columns]
+            better = scores > best
+            best[better] = scores[better]
+            best_row[better] = i
+            best_col[better] = columns[better]
+    return best, best_row, best_col, h, matrices
+
+
+def _traceback(matrices, query, target, matrix, gap_open, gap_extend, local, i, j):
+    """Walk back through the stored H/E/F matrices from cell (i, j)."""
+    h, e, f = (values[:, 0, :].astype(np.int64) for values in matrices)
+    ops = []
+    state = 'H'
+    while i > 0 or j > 0:
+        if state == 'H':
+            if local and h[i, j] == 0:
+                break
+            if i > 0 and j > 0 and h[i, j] == h[i - 1, j - 1] + matrix[query[i - 1], target[j - 1]]:
+                ops.append('M')
+                i, j = i - 1, j - 1
+            elif j > 0 and h[i, j] == e[i, j]:
+                state = 'E'
+            else:
+                state = 'F'
+        elif state == 'E':
+            ops.append('D')
+            state = 'H' if e[i, j] == h[i, j - 1] - gap_open else 'E'
+            j -= 1
+        else:
+            ops.append('I')
+            state = 'H' if f[i, j] == h[i - 1, j] - gap_open else 'F'
+            i -= 1
+    return i, j, ops[::-1]
+
+
+def _cigar(ops):
+    runs = []
+    for op in ops:
+        if runs and runs[-1][1] == op:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, op])
+    return ''.join(f'{count}{op}' for count, op in runs)
+
+
+def _check_gaps(gap_open, gap_extend, mode):
+    if mode not in ('local', 'global'):
+        raise ValueError(f"mode must be 'local' or 'global', not {mode!r}")
+    if gap_open < gap_extend or gap_extend < 0:
+        raise ValueError("Need gap_open >= gap_extend >= 0")
+
+
+def align(query, target, mode='local', match=2, mismatch=-3, gap_open=5, gap_extend=2,
+          matrix=None, traceback=True):
+    """
+    Align two nucleotide sequences with affine gap penalties.
+
+    A gap of length L costs gap_open + (L - 1) * gap_extend. Local mode is
+    Smith-Waterman, global mode is Needleman-Wunsch (both with Gotoh's
+    three-matrix recurrence).
+
+    Args:
+        query (str or bytes): Query sequence
+        target (str or bytes): Target sequence
+        mode (str): 'local' or 'global' (default: 'local')
+        match, mismatch (int): Scores used when matrix is None
+        gap_open (int): Penalty for the first base of a gap (default: 5)
+        gap_extend (int): Penalty for each further base (default: 2)
+        matrix (numpy.ndarray): Optional (5, 5) scoring matrix, see
+            scoring_matrix
+        traceback (bool): Recover the alignment; False keeps only one DP
+            row in memory and fills the start and CIGAR fields with None
+
+    Returns:
+        Alignment: Score, 0-based half-open query/target coordinates,
+            CIGAR (M/I/D relative to the query) and gapped strings
+    """
+    _check_gaps(gap_open, gap_extend, mode)
+    matrix = scoring_matrix(match, mismatch) if matrix is None else np.asarray(matrix)
+    local = mode == 'local'
+    query_codes = BASE_CODES[as_uint8(query)]
+    target_codes = BASE_CODES[as_uint8(target)]
+
+    best, best_row, best_col, last, matrices = _fill(
+        query_codes, target_codes[None, :], matrix, gap_open, gap_extend, local, keep=traceback)
+    if local:
+        score, i, j = int(best[0]), int(best_row[0]), int(best_col[0])
+    else:
+        score, i, j = int(last[0, -1]), len(query_codes), len(target_codes)
+    if not traceback:
+        return Alignment(score, None, i, None, j, None, None, None)
+
+    start_i, start_j, ops = _traceback(matrices, query_codes, target_codes, matrix,
+                                       gap_open, gap_extend, local, i, j)
+    query_text = query.decode('ascii') if isinstance(query, (bytes, bytearray)) else str(query)
+    target_text = target.decode('ascii') if isinstance(target, (bytes, bytearray)) else str(target)
+    query_aligned, target_aligned = [], []
+    qi, tj = start_i, start_j
+    for op in ops:
+        query_aligned.append(query_text[qi] if op != 'D' else '-')
+        target_aligned.append(target_text[tj] if op != 'I' else '-')
+        qi += op != 'D'
+        tj += op != 'I'
+    return Alignment(score, start_i, i, start_j, j, _cigar(ops),
+                     ''.join(query_aligned), ''.join(target_aligned))
+
+
+def align_batch(queries, target, offsets=None, mode='local', match=2, mismatch=-3, gap_open=5,
+                gap_extend=2, matrix=None, batch_size=4096):
+    """
+    Score many short queries against one target, without traceback.
+
+    Queries are padded into a (batch, length) code array, and the DP loops
+    once over the target bases while every query advances together. The
+    score profile for each target base against all query columns is built
+    once per batch and reused on every row. Run align() on the hits worth
+    a full traceback.
+
+    Args:
+        queries (list or buffer): Query sequences, or one concatenated
+            buffer when offsets is given
+        target (str or bytes): Shared target, e.g. an adapter or primer
+        offsets (array): n + 1 boundaries into the buffer (default: None)
+        mode, match, mismatch, gap_open, gap_extend, matrix: As in align()
+        batch_size (int): Queries aligned together (default: 4096)
+
+    Returns:
+        dict: 'score', 'query_end' and 'target_end' int64 arrays (ends are
+            0-based exclusive; in global mode they are the sequence lengths)
+    """
+    _check_gaps(gap_open, gap_extend, mode)
+    matrix = scoring_matrix(match, mismatch) if matrix is None else np.asarray(matrix)
+    local = mode == 'local'
+    buffer, offsets = as_buffer(queries, offsets)
+    target_codes = BASE_CODES[as_uint8(target)]
+    lengths = np.diff(offsets)
+    count = len(lengths)
+    scores = np.zeros(count, dtype=np.int64)
+    query_ends = np.zeros(count, dtype=np.int64)
+    target_ends = np.zeros(count, dtype=np.int64)
+
+    for first in range(0, count, batch_size):
+        last = min(first + batch_size, count)
+        batch_lengths = lengths[first:last]
+        width = int(batch_lengths.max()) if len(batch_lengths) else 0
+        codes = np.full((last - first, width), _PAD, dtype=np.uint8)
+        rows = np.repeat(np.arange(last - first), batch_lengths)
+        columns = np.arange(len(rows)) - np.repeat(offsets[first:last] - offsets[first],
+                                                   batch_lengths)
+        codes[rows, columns] = BASE_CODES[buffer[offsets[first]:offsets[last]]]
+
+        # Rows run over the target, columns over the queries
+        best, best_row, best_col, final, _ = _fill(target_codes, codes, matrix,
+                                                   gap_open, gap_extend, local)
+        if local:
+            scores[first:last] = best
+            target_ends[first:last] = best_row
+            query_ends[first:last] = best_col
+        else:
+            scores[first:last] = final[np.arange(last - first), batch_lengths]
+            target_ends[first:last] = len(target_codes)
+            query_ends[first:last] = batch_lengths
+    return {'score': scores, 'query_end': query_ends, 'target_end': target_ends}
@@ -0,0 +1,111 @@
+"""Single-pass streaming nucleotide composition of FASTA/FASTQ files"""
+
+import numpy as np
+
+from ..io.compression import open_sequence_file
+from ..io.readers import detect_format
+
+COLUMNS = ['A', 'C', 'G', 'T', 'N', 'iupac', 'other', 'lowercase']
+
+# Byte value -> category columns. Every sequence byte lands in exactly one
+# of the first seven columns; 'lowercase' (soft-masked) overlaps them.
+_CATEGORIES = np.zeros((256, len(COLUMNS)), dtype=np.int64)
+for _byte in range(256):
+    _char = chr(_byte) if _byte < 128 else ''
+    if _char and _char.upper() in 'ACGTN':
+        _CATEGORIES[_byte, COLUMNS.index(_char.upper())] = 1
+    elif _char and _char.upper() in 'RYSWKMBDHV':
+        _CATEGORIES[_byte, COLUMNS.index('iupac')] = 1
+    else:
+        _CATEGORIES[_byte, COLUMNS.index('other')] = 1
+    if _char.islower():
+        _CATEGORIES[_byte, COLUMNS.index('lowercase')] = 1
+
+
+def _line_chunks(f, chunk_size):
+    """Read large binary chunks, each extended to end on a line boundary."""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        if not chunk.endswith(b'\n'):
+            chunk += f.readline()
+        if not chunk.endswith(b'\n'):
+            chunk += b'\n'     # final line without a newline
+        yield chunk
+
+
+def nucleotide_composition(filename, fmt=None, chunk_size=1 << 24, per_record=True):
+    """
+    Count bases per record and overall in one streaming pass.
+
+    The file is read in large binary chunks (cut at line ends). For each
+    chunk, every sequence byte is tagged with its record and counted in a
+    single np.bincount into 256-bin histograms, which are then folded
+    into A/C/G/T/N/IUPAC/other/lowercase columns. Memory depends on the
+    chunk size, not on the file size.
+
+    Args:
+        filename (str): FASTA or FASTQ file (plain, gzip or BGZF)
+        fmt (str): 'fasta' or 'fastq' (default: detect from the file)
+        chunk_size (int): Bytes read per chunk (default: 16 MB)
+        per_record (bool): Keep per-record rows (default: True); turn off
+            to keep only global totals for very many records
+
+    Returns:
+        dict: 'columns' (COLUMNS), 'ids' and 'records' (an (n, 8) int64
+            array) when per_record, 'histogram' (256 global byte counts)
+            and 'totals' (column totals plus 'length' and 'gc_percent')
+    """
+    fmt = fmt or detect_format(filename)
+    histogram = np.zeros(256, dtype=np.int64)
+    ids, rows = [], []
+    lines_before = 0
+
+    with open_sequence_file(filename) as f:
+        for chunk in _line_chunks(f, chunk_size):
+            buffer = np.frombuffer(chunk, dtype=np.uint8)
+            is_newline = buffer == 10
+            line_ends = np.flatnonzero(is_newline)
+            line_starts = np.concatenate([[0], line_ends[:-1] + 1])
+            line_id = np.cumsum(is_newline) - is_newline
+
+            if fmt == 'fasta':
+                is_header_line = buffer[line_starts] == ord('>')
+                header_lines = np.flatnonzero(is_header_line)
+                record = np.cumsum(is_header_line)[line_id] - 1   # -1: record open from last chunk
+                in_sequence = ~is_header_line[line_id]
+            else:
+                absolute_line = line_id + lines_before
+                header_lines = np.flatnonzero((np.arange(len(line_starts)) + lines_before) % 4 == 0)
+                # Records already started before this chunk: ceil(lines_before / 4)
+                record = absolute_line // 4 - (lines_before + 3) // 4
+                in_sequence = absolute_line % 4 == 1
+                lines_before += len(line_starts)
+            in_sequence &= ~is_newline & (buffer != 13)
+
+            values = buffer[in_sequence]
+            histogram += np.bincount(values, minlength=256)
+            if not per_record:
+                continue
+
+            for line in header_lines.tolist():
+                header = chunk[line_starts[line] + 1:line_ends[line]].split(None, 1)
+                ids.append(header[0].decode('ascii') if header else '')
+            n_local = len(header_lines) + 1
+            local = record[in_sequence] + 1
+            counts = np.bincount(local * 256 + values, minlength=n_local * 256)
+            categories = counts.reshape(n_local, 256) @ _CATEGORIES
+            if rows:
+                rows[-1] = rows[-1] + categories[0]
+            rows.extend(categories[1:])
+
+    totals = dict(zip(COLUMNS, (histogram @ _CATEGORIES).tolist()))
+    totals['length'] = sum(totals[column] for column in COLUMNS[:-1])
+    totals['gc_percent'] = (totals['G'] + totals['C']) / totals['length'] * 100 \
+        if totals['length'] else float('nan')
+    result = {'columns': list(COLUMNS), 'histogram': histogram, 'totals': totals}
+    if per_record:
+        result['ids'] = ids
+        result['records'] = np.array(rows, dtype=np.int64).reshape(-1, len(COLUMNS))
+    return result
@@ -0,0 +1,247 @@
+"""CpG island detection with O(1) window statistics"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from ..utils.encoding import as_uint8
+
+CpGIsland = namedtuple('CpGIsland', ['start', 'end', 'gc', 'observed_expected', 'cpg_count'])
+
+# Published criteria; windows of `window` bases are tested, qualifying
+# windows are merged, and merged regions must pass again as a whole
+CRITERIA = {
+    'gardiner-garden': {'window': 200, 'min_length': 200, 'min_gc': 0.50, 'min_oe': 0.60},
+    'takai-jones': {'window': 200, 'min_length': 500, 'min_gc': 0.55, 'min_oe': 0.65},
+}
+
+SHORE_SIZE = 2000
+SHELF_SIZE = 2000
+
+
+def _cumulative_counts(buffer):
+    """Cumulative C, G and CpG counts; entry i counts positions before i."""
+    is_c = (buffer == ord('C')) | (buffer == ord('c'))
+    is_g = (buffer == ord('G')) | (buffer == ord('g'))
+    is_cpg = np.zeros(len(buffer), dtype=bool)
+    is_cpg[:-1] = is_c[:-1] & is_g[1:]
+    counts = []
+    for mask in (is_c, is_g, is_cpg):
+        cumulative = np.zeros(len(buffer) + 1, dtype=np.int64)
+        np.cumsum(mask, out=cumulative[1:])
+        counts.append(cumulative)
+    return counts
+
+
+def _region_stats(cumulative, starts, ends):
+    """GC fraction, CpG observed/expected ratio and CpG count of [start, end) regions."""
+    c_cum, g_cum, cpg_cum = cumulative
+    lengths = ends - starts
+    c = c_cum[ends] - c_cum[starts]
+    g = g_cum[ends] - g_cum[starts]
+    cpg = cpg_cum[ends - 1] - cpg_cum[starts]      # dinucleotides fully inside
+    gc = (c + g) / lengths
+    with np.errstate(divide='ignore', invalid='ignore'):
+        observed_expected = np.where(c * g > 0, cpg * lengths / (c * g), 0.0)
+    return gc, observed_expected, cpg
+
+
+def iter_cpg_islands(chunks, criteria='gardiner-garden', step=1):
+    """
+    Stream CpG islands over one sequence supplied in consecutive chunks.
+
+    Cumulative C, G and CpG counts give each window's GC fraction and
+    observed/expected CpG ratio in O(1). Qualifying windows are merged
+    into candidate islands, which are kept if they pass the criteria as
+    a whole. Only the bases of the current candidate and the last window
+    are carried between chunks.
+
+    Args:
+        chunks (iterable): Consecutive pieces of one sequence, e.g. from
+            IndexedFasta.iter_chunks
+        criteria (str or dict): 'gardiner-garden', 'takai-jones' or a dict
+            with window, min_length, min_gc and min_oe (default:
+            'gardiner-garden')
+        step (int): Distance between window starts (default: 1)
+
+    Yields:
+        CpGIsland(start, end, gc, observed_expected, cpg_count) tuples in
+            order, with 0-based half-open coordinates
+    """
+    if isinstance(criteria, str):
+        criteria = CRITERIA[criteria]
+    window = criteria['window']
+
+    carry = np.zeros(0, dtype=np.uint8)
+    carry_start = 0
+    next_start = 0
+    island = None       # [start, end] of the candidate still being extended
+
+    def finish(region, cumulative, offset):
+        start, end = region
+        gc, oe, cpg = _region_stats(cumulative, np.array([start - offset]), np.array([end - offset]))
+        if (end - start >= criteria['min_length'] and gc[0] >= criteria['min_gc']
+                and oe[0] >= criteria['min_oe']):
+            return CpGIsland(start, end, float(gc[0]), float(oe[0]), int(cpg[0]))
+        return None
+
+    buffer_start = 0
+    cumulative = None
+    for chunk in chunks:
+        buffer = np.concatenate([carry, as_uint8(chunk)])
+        buffer_start = carry_start
+        buffer_end = buffer_start + len(buffer)
+        cumulative = _cumulative_counts(buffer)
+        if next_start + window > buffer_end:
+            carry = buffer
+            continue
+
+        starts = np.arange(next_start, buffer_end - window + 1, step, dtype=np.int64)
+        gc, oe, _ = _region_stats(cumulative, starts - buffer_start, starts - buffer_start + window)
+        passing = starts[(gc >= criteria['min_gc']) & (oe >= criteria['min_oe'])]
+        next_start = int(starts[-1]) + step
+
+        # Merge overlapping qualifying windows into regions
+        if len(passing):
+            breaks = np.flatnonzero(passing[1:] > passing[:-1] + window) + 1
+            region_starts = passing[np.concatenate([[0], breaks])]
+            region_ends = passing[np.concatenate([breaks - 1, [len(passing) - 1]])] + window
+            for start, end in zip(region_starts.tolist(), region_ends.tolist()):
+                if island is not None and start <= island[1]:
+                    island[1] = max(island[1], end)
+                    continue
+                if island is not None:
+                    found = finish(island, cumulative, buffer_start)
+                    if found:
+                        yield found
+                island = [start, end]
+
+        # A candidate is complete once no future window can overlap it
+        if island is not None and island[1] < next_start:
+            found = finish(island, cumulative, buffer_start)
+            if found:
+                yield found
+            island = None
+
+        keep_from = min(next_start, buffer_end) if island is None else island[0]
+        carry = buffer[keep_from - buffer_start:].copy()
+        carry_start = keep_from
+
+    if island is not None:
+        found = finish(island, cumulative, buffer_start)
+        if found:
+            yield found
+
+
+def cpg_islands(sequence, criteria='gardiner-garden', step=1, chunk_size=1000000):
+    """
+    Find CpG islands in one in-memory sequence.
+
+    Args:
+        sequence (str or bytes): Sequence to scan
+        criteria (str or dict): See iter_cpg_islands
+        step (int): Distance between window starts (default: 1)
+        chunk_size (int): Bases processed at a time (default: 1000000)
+
+    Returns:
+        list: CpGIsland tuples
+    """
+    buffer = as_uint8(sequence)
+    chunks = (buffer[i:i + chunk_size] for i in range(0, len(buffer), chunk_size))
+    return list(iter_cpg_islands(chunks, criteria, step))
+
+
+def genome_cpg_islands(fasta, names=None, criteria='gardiner-garden', step=1,
+                       chunk_size=1000000):
+    """
+    Stream CpG islands chromosome by chromosome from an IndexedFasta.
+
+    Args:
+        fasta (IndexedFasta): Indexed reference
+        names (list): Sequences to scan (default: all, in index order)
+        criteria (str or dict): See iter_cpg_islands
+        step (int): Distance between window starts (default: 1)
+        chunk_size (int): Bases fetched at a time (default: 1000000)
+
+    Yields:
+        tuple: (chrom, CpGIsland)
+    """
+    for name in names or list(fasta.keys()):
+        for island in iter_cpg_islands(fasta.iter_chunks(name, chunk_size), criteria, step):
+            yield name, island
+
+
+def _merge(intervals):
+    """Merge overlapping (start, end) intervals."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        elif start < end:
+            merged.append([start, end])
+    return merged
+
+
+def _subtract(intervals, blockers):
+    """Parts of merged intervals not covered by merged blockers."""
+    pieces = []
+    for start, end in intervals:
+        for block_start, block_end in blockers:
+            if block_end <= start or block_start >= end:
+                continue
+            if block_start > start:
+                pieces.append([start, block_start])
+            start = max(start, block_end)
+        if start < end:
+            pieces.append([start, end])
+    return pieces
+
+
+def cpg_annotations(chrom, islands, chrom_length):
+    """
+    Island, shore (0-2 kb) and shelf (2-4 kb) intervals around CpG islands.
+
+    Features never overlap: islands take priority over shores, and shores
+    over shelves, as in the usual methylation array annotation. Flanks are
+    clipped to the chromosome.
+
+    Args:
+        chrom (str): Chromosome name
+        islands (list): CpGIsland tuples for this chromosome
+        chrom_length (int): Chromosome length
+
+    Returns:
+        list: (chrom, start, end, feature) tuples sorted by start
+    """
+    def flanks(near, far):
+        for island in islands:
+            yield max(island.start - far, 0), max(island.start - near, 0)
+            yield min(island.end + near, chrom_length), min(island.end + far, chrom_length)
+
+    island_intervals = _merge((island.start, island.end) for island in islands)
+    shores = _subtract(_merge(flanks(0, SHORE_SIZE)), island_intervals)
+    shelves = _subtract(_subtract(_merge(flanks(SHORE_SIZE, SHORE_SIZE + SHELF_SIZE)),
+                                  island_intervals), _merge(shores))
+
+    features = [(chrom, start, end, feature)
+                for feature, intervals in (('island', island_intervals), ('shore', shores),
+                                           ('shelf', shelves))
+                for start, end in intervals]
+    features.sort(key=lambda feature: (feature[1], feature[2]))
+    return features
+
+
+def write_cpg_bed(output, features):
+    """
+    Write (chrom, start, end, feature) tuples as BED lines.
+
+    Args:
+        output (str or file): Path to write, or an open text file handle
+        features (iterable): Tuples from cpg_annotations
+    """
+    lines = [f"{chrom}\t{start}\t{end}\t{feature}\n" for chrom, start, end, feature in features]
+    if isinstance(output, str):
+        with open(output, 'w') as f:
+            f.writelines(lines)
+    else:
+        output.writelines(lines)
@@ -0,0 +1,278 @@
+"""Suffix array and FM-index for exact substring search in reference sequences"""
+
+import json
+import math
+import os
+
+import numpy as np
+
+from ..io.readers import iter_fasta
+from ..utils.encoding import as_buffer, as_uint8
+
+# Index alphabet: '$' < A < C < G < T < everything else. Code 5 also
+# separates records, so no match ever spans two sequences.
+SENTINEL, SEPARATOR = 0, 5
+SIGMA = 6
+_CODES = np.full(256, SEPARATOR, dtype=np.uint8)
+for _code, _bases in enumerate(('Aa', 'Cc', 'Gg', 'TtUu'), start=1):
+    for _base in _bases:
+        _CODES[ord(_base)] = _code
+
+# Symbols packed into the first sort key before prefix doubling starts
+_INITIAL_PREFIX = 16
+
+# Longest text whose doubling keys rank * (n + 1) + rank (ranks <= n) fit in int64
+MAX_TEXT_LENGTH = math.isqrt(1 << 63) - 1
+
+
+def suffix_array(text):
+    """
+    Build the suffix array of a code array by prefix doubling.
+
+    Suffixes are first ranked by their first 16 symbols packed into one
+    integer key. Each round then sorts by (rank[i], rank[i + h]), doubling
+    the compared prefix length h, until every rank is distinct. Each round
+    is one NumPy argsort, so the cost is O(n log n) per round and the
+    number of rounds grows with the longest repeat.
+
+    The pair key rank * (n + 1) + rank is an int64, which limits the text
+    to about 3.0e9 symbols (MAX_TEXT_LENGTH).
+
+    Args:
+        text (numpy.ndarray): uint8 codes ending with a unique smallest
+            sentinel
+
+    Returns:
+        numpy.ndarray: int64 suffix start positions in sorted order
+    """
+    n = len(text)
+    if n > MAX_TEXT_LENGTH:
+        raise ValueError(f"Text of {n} symbols is too long for the int64 sort keys "
+                         f"(limit {MAX_TEXT_LENGTH})")
+    key = np.zeros(n, dtype=np.int64)
+    for j in range(_INITIAL_PREFIX):
+        key *= SIGMA
+        if j < n:
+            key[:n - j] += text[j:]
+
+    h = _INITIAL_PREFIX
+    while True:
+        order = np.argsort(key)
+        sorted_key = key[order]
+        rank_sorted = np.cumsum(np.concatenate([[1], sorted_key[1:] != sorted_key[:-1]]))
+        if rank_sorted[-1] == n:
+            return order
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = rank_sorted
+        # Rank 0 stands for "past the end", below every real rank
+        key = rank * (n + 1)
+        if h < n:
+            key[:n - h] += rank[h:]
+        h *= 2
+
+
+class FMIndex:
+    """
+    FM-index (BWT, C array, sampled Occ table) plus the full suffix array.
+
+    Several reference sequences are joined with a separator into one text.
+    count answers from the BWT alone; locate reads the matching suffix
+    array interval. Arrays are saved as .npy files and memory-mapped on
+    load, so an index can be shared between processes without reading it
+    into memory.
+
+    Usage:
+        index = FMIndex.from_fasta('reference.fasta')
+        index.save('reference_index')
+        index = FMIndex.load('reference_index')
+        index.count_batch(reads)
+    """
+
+    def __init__(self, sa, bwt, occ, counts, starts, names, sample_rate):
+        self.sa = sa
+        self.bwt = bwt
+        self.occ = occ
+        self.counts = counts
+        self.starts = starts
+        self.names = names
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def build(cls, sequences, names=None, sample_rate=16):
+        """
+        Index a set of reference sequences.
+
+        Args:
+            sequences (dict or list): Sequences as str/bytes, e.g. the dict
+                returned by read_fasta (its keys become the names)
+            names (list): Names for a list of sequences (default: '0', '1', ...)
+            sample_rate (int): BWT positions between Occ samples; lower is
+                faster to query and larger on disk (default: 16)
+
+        Returns:
+            FMIndex: The index
+        """
+        if isinstance(sequences, dict):
+            names = list(sequences)
+            sequences = list(sequences.values())
+        else:
+            sequences = list(sequences)
+            names = list(names) if names is not None else [str(i) for i in range(len(sequences))]
+
+        parts, starts, position = [], [], 0
+        for sequence in sequences:
+            starts.append(position)
+            parts.append(_CODES[as_uint8(sequence)])
+            parts.append(np.array([SEPARATOR], dtype=np.uint8))
+            position += len(parts[-2]) + 1
+        parts.append(np.array([SENTINEL], dtype=np.uint8))
+        text = np.concatenate(parts)
+
+        sa = suffix_array(text)
+        bwt = text[sa - 1]   # sa == 0 wraps to the sentinel at the end
+        index_type = np.uint32 if len(text) < 1 << 32 else np.int64
+
+        # Occ sample b holds symbol counts in bwt[:b * sample_rate]
+        blocks = -(-len(bwt) // sample_rate)
+        padded = np.full(blocks * sample_rate, SIGMA, dtype=np.uint8)
+        padded[:len(bwt)] = bwt
+        occ = np.zeros((blocks + 1, SIGMA), dtype=index_type)
+        for code in range(SIGMA):
+            per_block = (padded.reshape(blocks, sample_rate) == code).sum(axis=1)
+            occ[1:, code] = np.cumsum(per_block)
+
+        counts = np.zeros(SIGMA + 1, dtype=np.int64)
+        counts[1:] = np.cumsum(np.bincount(text, minlength=SIGMA))
+        return cls(sa.astype(np.int32 if len(text) < 1 << 31 else np.int64), bwt, occ,
+                   counts, np.array(starts, dtype=np.int64), names, sample_rate)
+
+    @classmethod
+    def from_fasta(cls, filename, sample_rate=16):
+        """Index every record of a FASTA file, named by record ID."""
+        names, sequences = [], []
+        for seq_id, _, sequence in iter_fasta(filename, as_bytes=True):
+            names.append(seq_id.decode('ascii'))
+            sequences.append(sequence)
+        return cls.build(sequences, names, sample_rate)
+
+    def save(self, directory):
+        """Write the index arrays as .npy files into a directory."""
+        os.makedirs(directory, exist_ok=True)
+        for name in ('sa', 'bwt', 'occ', 'counts', 'starts'):
+            np.save(os.path.join(directory, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(directory, 'index.json'), 'w') as f:
+            json.dump({'names': self.names, 'sample_rate': self.sample_rate}, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Open an index written by save().
+
+        Args:
+            directory (str): Index directory
+            mmap (bool): Memory-map the arrays instead of reading them
+                (default: True)
+        """
+        mode = 'r' if mmap else None
+        arrays = [np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mode)
+                  for name in ('sa', 'bwt', 'occ', 'counts', 'starts')]
+        with open(os.path.join(directory, 'index.json')) as f:
+            meta = json.load(f)
+        return cls(*arrays, meta['names'], meta['sample_rate'])
+
+    def __len__(self):
+        return len(self.bwt)
+
+    def _rank(self, codes, positions):
+        """Occurrences of codes[i] in bwt[:positions[i]], vectorized."""
+        block = positions // self.sample_rate
+        result = self.occ[block, codes].astype(np.int64)
+        base = block * self.sample_rate
+        for offset in range(self.sample_rate):
+            index = base + offset
+            inside = index < positions
+            if not inside.any():
+                break
+            index = np.minimum(index, len(self.bwt) - 1)
+            result += inside & (self.bwt[index] == codes)
+        return result
+
+    def _search(self, buffer, offsets):
+        """Backward search every pattern; returns the [lo, hi) SA intervals."""
+        codes = _CODES[buffer]
+        lengths = np.diff(offsets)
+        lo = np.zeros(len(lengths), dtype=np.int64)
+        hi = np.where(lengths > 0, len(self.bwt), 0).astype(np.int64)
+        for step in range(int(lengths.max()) if len(lengths) else 0):
+            active = np.flatnonzero((lengths > step) & (hi > lo))
+            if not len(active):
+                break
+            symbols = codes[offsets[1:][active] - 1 - step]
+            valid = symbols != SEPARATOR
+            hi[active[~valid]] = lo[active[~valid]]
+            active, symbols = active[valid], symbols[valid]
+            lo[active] = self.counts[symbols] + self._rank(symbols, lo[active])
+            hi[active] = self.counts[symbols] + self._rank(symbols, hi[active])
+        return lo, hi
+
+    def count_batch(self, patterns, offsets=None):
+        """
+        Count exact occurrences of many patterns in one backward search.
+
+        All patterns take each backward-search step together, so the cost
+        per step is a few array operations regardless of the batch size.
+        Patterns with N or other non-ACGT bases, and empty patterns, never
+        match.
+
+        Args:
+            patterns (list or buffer): Patterns as str/bytes, or one
+                concatenated buffer when offsets is given
+            offsets (array): n + 1 boundaries into the buffer (default: None)
+
+        Returns:
+            numpy.ndarray: int64 occurrence count per pattern
+        """
+        lo, hi = self._search(*as_buffer(patterns, offsets))
+        return hi - lo
+
+    def locate_batch(self, patterns, offsets=None, max_hits=None):
+        """
+        Find every occurrence of many patterns.
+
+        Args:
+            patterns (list or buffer): Patterns, as in count_batch
+            offsets (array): n + 1 boundaries into the buffer (default: None)
+            max_hits (int): Report at most this many hits per pattern
+                (default: None, all)
+
+        Returns:
+            dict: 'pattern', 'record' and 'position' int64 arrays with one
+                entry per hit, grouped by pattern; record indexes
+                self.names and position is 0-based within the record
+        """
+        lo, hi = self._search(*as_buffer(patterns, offsets))
+        sizes = hi - lo
+        if max_hits is not None:
+            sizes = np.minimum(sizes, max_hits)
+        pattern = np.repeat(np.arange(len(sizes)), sizes)
+        within = np.arange(len(pattern)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        text_positions = self.sa[lo[pattern] + within].astype(np.int64)
+        record = np.searchsorted(self.starts, text_positions, side='right') - 1
+        return {'pattern': pattern, 'record': record,
+                'position': text_positions - self.starts[record]}
+
+    def count(self, pattern):
+        """Number of exact occurrences of one pattern."""
+        return int(self.count_batch([pattern])[0])
+
+    def locate(self, pattern):
+        """
+        Occurrences of one pattern.
+
+        Returns:
+            list: (record name, 0-based position) tuples sorted by record
+                and position
+        """
+        hits = self.locate_batch([pattern])
+        return sorted((self.names[record], int(position))
+                      for record, position in zip(hits['record'], hits['position']))
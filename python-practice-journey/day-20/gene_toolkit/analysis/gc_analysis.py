@@ -0,0 +1,99 @@
+"""Sliding-window GC content along whole chromosomes"""
+
+import numpy as np
+
+from ..utils.encoding import GC_TABLE, as_uint8, translate_buffer
+
+_ACGT_TABLE = bytes(1 if chr(i) in 'ACGTSWacgtsw' else 0 for i in range(256))
+
+
+def _cumulative(buffer, table):
+    """Cumulative count of table hits; result[i] is the count in buffer[:i]."""
+    counts = np.zeros(len(buffer) + 1, dtype=np.int64)
+    np.cumsum(translate_buffer(buffer, table), out=counts[1:])
+    return counts
+
+
+def _window_fractions(buffer, starts, window, ignore_n):
+    """GC fraction of buffer[s:s + window] for every s in starts, O(1) each."""
+    gc = _cumulative(buffer, GC_TABLE)
+    gc_counts = gc[starts + window] - gc[starts]
+    if ignore_n:
+        called = _cumulative(buffer, _ACGT_TABLE)
+        totals = called[starts + window] - called[starts]
+    else:
+        totals = np.full(len(starts), window, dtype=np.int64)
+
+    fractions = np.full(len(starts), np.nan)
+    np.divide(gc_counts, totals, out=fractions, where=totals > 0)
+    return fractions
+
+
+def gc_windows(sequence, window=1000, step=100, ignore_n=False):
+    """
+    Calculate GC fraction in sliding windows along one sequence.
+
+    A cumulative-sum array over the sequence makes each window a single
+    subtraction, so the cost is O(length) whatever the window size.
+    Only full windows are reported.
+
+    Args:
+        sequence (str, bytes or array): Sequence to profile
+        window (int): Window size in bases (default: 1000)
+        step (int): Distance between window starts (default: 100)
+        ignore_n (bool): Use only A/C/G/T (and S/W) bases as the
+            denominator instead of the window size (default: False)
+
+    Returns:
+        tuple: (starts, fractions) as NumPy arrays; fractions are NaN for
+            windows with no countable bases
+    """
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step must be positive")
+    buffer = as_uint8(sequence)
+    if len(buffer) < window:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    starts = np.arange(0, len(buffer) - window + 1, step, dtype=np.int64)
+    return starts, _window_fractions(buffer, starts, window, ignore_n)
+
+
+def iter_gc_windows(chunks, window=1000, step=100, ignore_n=False):
+    """
+    Stream GC windows over a sequence supplied in consecutive chunks.
+
+    Bases still needed by the next window are carried over between
+    chunks, so memory depends on the chunk size and window, not on
+    chromosome length. Output matches gc_windows on the joined sequence.
+
+    Args:
+        chunks (iterable): Consecutive pieces of one sequence, e.g. from
+            IndexedFasta.iter_chunks
+        window (int): Window size in bases (default: 1000)
+        step (int): Distance between window starts (default: 100)
+        ignore_n (bool): See gc_windows (default: False)
+
+    Yields:
+        tuple: (starts, fractions) arrays for the windows completed by
+            each chunk, with starts in whole-sequence coordinates
+    """
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step must be positive")
+    carry = np.zeros(0, dtype=np.uint8)
+    carry_start = 0     # sequence position of carry[0]
+    next_start = 0      # sequence position of the next window to emit
+
+    for chunk in chunks:
+        buffer = np.concatenate([carry, as_uint8(chunk)])
+        buffer_end = carry_start + len(buffer)
+        if next_start + window > buffer_end:
+            carry = buffer
+            continue
+
+        starts = np.arange(next_start, buffer_end - window + 1, step, dtype=np.int64)
+        local = buffer[next_start - carry_start:]
+        yield starts, _window_fractions(local, starts - next_start, window, ignore_n)
+
+        next_start = int(starts[-1]) + step
+        keep_from = min(next_start, buffer_end)
+        carry = buffer[keep_from - carry_start:].copy()
+        carry_start = keep_from
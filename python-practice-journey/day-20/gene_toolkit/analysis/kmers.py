@@ -0,0 +1,236 @@
+"""2-bit packed k-mer counting for k <= 31"""
+
+import numpy as np
+
+from ..core.genetic_code import BASE_CODES
+from ..io.readers import iter_fasta, iter_fastq
+from ..utils.encoding import as_uint8
+
+MAX_K = 31
+
+
+def encode_kmer(kmer):
+    """Pack an ACGT k-mer string into an integer (A=0, C=1, G=2, T=3)."""
+    value = 0
+    for base in kmer.upper():
+        value = (value << 2) | 'ACGT'.index(base)
+    return value
+
+
+def decode_kmer(value, k):
+    """Unpack an integer produced by encode_kmer back into a k-mer string."""
+    value = int(value)
+    return ''.join('ACGT'[(value >> (2 * (k - 1 - i))) & 3] for i in range(k))
+
+
+def _join_windows(left, left_k, right, right_k, reverse):
+    """
+    Combine packed left_k-mers and right_k-mers into (left_k + right_k)-mers.
+
+    Forward k-mers put the left part in the high bits; reverse-complement
+    k-mers are built back to front, so the right part goes high instead.
+    """
+    count = len(left) - right_k
+    if reverse:
+        return left[:count] | (right[left_k:left_k + count] << np.uint64(2 * left_k))
+    return (left[:count] << np.uint64(2 * right_k)) | right[left_k:left_k + count]
+
+
+def _pack_windows(codes, k, reverse=False):
+    """
+    Pack every window of k 2-bit codes into a uint64.
+
+    Windows are assembled by doubling (1-mers, 2-mers, 4-mers, ...) and
+    joining the powers of two that make up k, so only O(log k) passes
+    over the sequence are needed.
+    """
+    power = (np.uint64(3) - codes) if reverse else codes.astype(np.uint64)
+    power_k = 1
+    result, result_k = None, 0
+    remaining = k
+    while True:
+        if remaining & 1:
+            if result is None:
+                result, result_k = power, power_k
+            else:
+                result = _join_windows(result, result_k, power, power_k, reverse)
+                result_k += power_k
+        remaining >>= 1
+        if not remaining:
+            return result
+        power = _join_windows(power, power_k, power, power_k, reverse)
+        power_k *= 2
+
+
+def kmer_array(sequence, k, canonical=True):
+    """
+    Encode every k-mer of a sequence as a uint64.
+
+    k-mers are packed from the 2-bit code array by doubling shifted views,
+    so the work is vectorized over all positions and takes O(log k)
+    passes. Windows containing N or any other non-ACGT base are dropped.
+
+    Args:
+        sequence (str, bytes or array): Sequence to encode
+        k (int): k-mer size, 1 to 31
+        canonical (bool): Keep the smaller of each k-mer and its reverse
+            complement (default: True)
+
+    Returns:
+        numpy.ndarray: uint64 k-mer codes in sequence order
+    """
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
+    codes = BASE_CODES[as_uint8(sequence)]
+    if len(codes) < k:
+        return np.zeros(0, dtype=np.uint64)
+
+    # Invalid bases get code 0 here and are filtered out below
+    clean = np.where(codes > 3, 0, codes).astype(np.uint64)
+    kmers = _pack_windows(clean, k)
+    if canonical:
+        np.minimum(kmers, _pack_windows(clean, k, reverse=True), out=kmers)
+
+    invalid = np.zeros(len(codes) + 1, dtype=np.int64)
+    np.cumsum(codes > 3, out=invalid[1:])
+    return kmers[invalid[k:] == invalid[:-k]]
+
+
+def merge_counts(kmers_a, counts_a, kmers_b, counts_b):
+    """
+    Merge two sorted (kmers, counts) tables into one.
+
+    Counts are summed in int64 with np.add.reduceat over the sorted
+    concatenation, so they stay exact at any size.
+
+    Args:
+        kmers_a, kmers_b (numpy.ndarray): Sorted unique uint64 k-mers
+        counts_a, counts_b (numpy.ndarray): Counts for each k-mer
+
+    Returns:
+        tuple: (kmers, counts) sorted by k-mer
+    """
+    kmers = np.concatenate([kmers_a, kmers_b]).astype(np.uint64)
+    counts = np.concatenate([counts_a, counts_b]).astype(np.int64)
+    if not len(kmers):
+        return kmers, counts
+    order = np.argsort(kmers, kind='stable')
+    kmers, counts = kmers[order], counts[order]
+    starts = np.flatnonzero(np.concatenate([[True], kmers[1:] != kmers[:-1]]))
+    return kmers[starts], np.add.reduceat(counts, starts)
+
+
+class KmerCounter:
+    """
+    Streaming k-mer counter with sorted-array storage.
+
+    k-mers are buffered and periodically reduced with sort + unique, so
+    memory stays proportional to the number of distinct k-mers plus one
+    chunk. Counters built in separate processes can be saved, loaded and
+    merged.
+
+    Usage:
+        counter = KmerCounter(21)
+        counter.add_fasta('reads.fasta')
+        counter.count('ACGTACGTACGTACGTACGTA')
+    """
+
+    def __init__(self, k, canonical=True, chunk_size=10000000):
+        """
+        Args:
+            k (int): k-mer size, 1 to 31
+            canonical (bool): Count canonical k-mers (default: True)
+            chunk_size (int): Buffered k-mers before each reduction
+                (default: 10000000)
+        """
+        if not 1 <= k <= MAX_K:
+            raise ValueError(f"k must be between 1 and {MAX_K}")
+        self.k = k
+        self.canonical = canonical
+        self.chunk_size = chunk_size
+        self._kmers = np.zeros(0, dtype=np.uint64)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._pending = []
+        self._pending_size = 0
+
+    def add(self, sequence):
+        """Count the k-mers of one sequence."""
+        kmers = kmer_array(sequence, self.k, self.canonical)
+        self._pending.append(kmers)
+        self._pending_size += len(kmers)
+        if self._pending_size >= self.chunk_size:
+            self._flush()
+
+    def add_fasta(self, filename):
+        """Count k-mers of every record in a FASTA file, one record at a time."""
+        for _, _, sequence in iter_fasta(filename, as_bytes=True):
+            self.add(sequence)
+
+    def add_fastq(self, filename):
+        """Count k-mers of every read in a FASTQ file."""
+        for _, _, sequence, _ in iter_fastq(filename, as_bytes=True):
+            self.add(sequence)
+
+    def _flush(self):
+        if not self._pending:
+            return
+        chunk = np.concatenate(self._pending)
+        self._pending = []
+        self._pending_size = 0
+        kmers, counts = np.unique(chunk, return_counts=True)
+        self._kmers, self._counts = merge_counts(self._kmers, self._counts, kmers, counts)
+
+    def merge(self, other):
+        """Add the counts of another KmerCounter with the same settings."""
+        if (other.k, other.canonical) != (self.k, self.canonical):
+            raise ValueError("Cannot merge counters with different k or canonical setting")
+        self._flush()
+        kmers, counts = other.counts()
+        self._kmers, self._counts = merge_counts(self._kmers, self._counts, kmers, counts)
+
+    def counts(self):
+        """
+        Return all counts.
+
+        Returns:
+            tuple: (kmers, counts) arrays sorted by k-mer code
+        """
+        self._flush()
+        return self._kmers, self._counts
+
+    def __len__(self):
+        self._flush()
+        return len(self._kmers)
+
+    def count(self, kmer):
+        """
+        Return the count of one k-mer (str or packed int) by binary search.
+
+        A str k-mer must be exactly k A/C/G/T bases (U reads as T);
+        anything else raises ValueError.
+        """
+        if isinstance(kmer, str):
+            if len(kmer) != self.k:
+                raise ValueError(f"k-mer {kmer!r} has length {len(kmer)}, expected {self.k}")
+            if np.any(BASE_CODES[as_uint8(kmer)] > 3):
+                raise ValueError(f"k-mer {kmer!r} contains a base other than A/C/G/T")
+            kmer = int(kmer_array(kmer, self.k, canonical=self.canonical)[0])
+        self._flush()
+        index = np.searchsorted(self._kmers, np.uint64(kmer))
+        if index < len(self._kmers) and self._kmers[index] == kmer:
+            return int(self._counts[index])
+        return 0
+
+    def save(self, filename):
+        """Write counts to a .npz file (for merging across processes)."""
+        kmers, counts = self.counts()
+        np.savez(filename, kmers=kmers, counts=counts, k=self.k, canonical=self.canonical)
+
+    @classmethod
+    def load(cls, filename):
+        """Read a counter written by save()."""
+        with np.load(filename) as data:
+            counter = cls(int(data['k']), bool(data['canonical']))
+            counter._kmers = data['kmers']
+            counter._counts = data['counts']
+        return counter
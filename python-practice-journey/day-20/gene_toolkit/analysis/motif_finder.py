@@ -0,0 +1,166 @@
+"""Multi-pattern motif search with an Aho-Corasick automaton"""
+
+from collections import deque, namedtuple
+from itertools import product
+
+from ..core.sequence import reverse_complement
+
+MotifHit = namedtuple('MotifHit', ['motif', 'strand', 'position'])
+
+# Concrete bases behind each IUPAC code
+IUPAC_CODES = {
+    'A': 'A', 'C': 'C', 'G': 'G', 'T': 'T', 'U': 'T',
+    'R': 'AG', 'Y': 'CT', 'S': 'CG', 'W': 'AT', 'K': 'GT', 'M': 'AC',
+    'B': 'CGT', 'D': 'AGT', 'H': 'ACT', 'V': 'ACG', 'N': 'ACGT',
+}
+
+# Input bytes to automaton symbols: A=0, C=1, G=2, T/U=3, anything else=4
+# (str.find gives -1 for other bytes, which % 5 turns into 4)
+_SYMBOLS = bytes('ACGT'.find(chr(i).upper().replace('U', 'T')) % 5 for i in range(256))
+_ALPHABET_SIZE = 5
+
+
+def expand_motif(motif, max_variants=4096):
+    """
+    Expand a degenerate IUPAC motif into all concrete ACGT sequences.
+
+    Args:
+        motif (str): Motif using IUPAC codes
+        max_variants (int): Refuse motifs that expand further (default: 4096)
+
+    Returns:
+        list: Concrete motif sequences
+    """
+    try:
+        choices = [IUPAC_CODES[base] for base in motif.upper()]
+    except KeyError as error:
+        raise ValueError(f"Invalid IUPAC code {error.args[0]!r} in motif {motif!r}") from None
+    count = 1
+    for options in choices:
+        count *= len(options)
+    if count > max_variants:
+        raise ValueError(f"Motif {motif!r} expands to {count} variants (max {max_variants})")
+    return [''.join(variant) for variant in product(*choices)]
+
+
+class MotifAutomaton:
+    """
+    Aho-Corasick automaton compiled from many (possibly degenerate) motifs.
+
+    Degenerate motifs are expanded to concrete patterns and, for
+    both-strand search, reverse complements are added as extra patterns,
+    so every sequence is scanned exactly once regardless of how many
+    motifs are loaded.
+
+    Usage:
+        automaton = MotifAutomaton({'TATA': 'TATAWAWR', 'CAAT': 'GGCCAATCT'})
+        hits = automaton.search(promoter_sequence)
+    """
+
+    def __init__(self, motifs, both_strands=True, max_variants=4096):
+        """
+        Compile motifs into a deterministic automaton.
+
+        Args:
+            motifs (dict or list): Name mapped to IUPAC pattern, or a list
+                of patterns (each pattern is then its own name)
+            both_strands (bool): Also report reverse-strand hits (default: True)
+            max_variants (int): Expansion limit per motif (default: 4096)
+        """
+        if not isinstance(motifs, dict):
+            motifs = {motif: motif for motif in motifs}
+        self.motifs = dict(motifs)
+        self.both_strands = both_strands
+
+        # Trie over concrete patterns; outputs are (name, strand, length)
+        self._children = [{}]
+        self._outputs = [[]]
+        for name, pattern in self.motifs.items():
+            for variant in expand_motif(pattern, max_variants):
+                self._add(variant, (name, '+', len(variant)))
+                if both_strands:
+                    self._add(reverse_complement(variant), (name, '-', len(variant)))
+        self._build()
+
+    def _add(self, pattern, output):
+        state = 0
+        for base in pattern:
+            symbol = 'ACGT'.index(base)
+            children = self._children[state]
+            if symbol not in children:
+                children[symbol] = len(self._children)
+                self._children.append({})
+                self._outputs.append([])
+            state = children[symbol]
+        if output not in self._outputs[state]:
+            self._outputs[state].append(output)
+
+    def _build(self):
+        """Add failure links and flatten into a full transition table."""
+        state_count = len(self._children)
+        fail = [0] * state_count
+        delta = [0] * (state_count * _ALPHABET_SIZE)
+
+        queue = deque()
+        for symbol in range(4):
+            child = self._children[0].get(symbol, 0)
+            delta[symbol] = child
+            if child:
+                queue.append(child)
+        while queue:
+            state = queue.popleft()
+            self._outputs[state].extend(self._outputs[fail[state]])
+            for symbol in range(4):
+                child = self._children[state].get(symbol)
+                if child is None:
+                    delta[state * _ALPHABET_SIZE + symbol] = delta[fail[state] * _ALPHABET_SIZE + symbol]
+                else:
+                    fail[child] = delta[fail[state] * _ALPHABET_SIZE + symbol]
+                    delta[state * _ALPHABET_SIZE + symbol] = child
+                    queue.append(child)
+            # symbol 4 (N or other) always returns to the root
+
+        self._delta = delta
+        self._children = None
+
+    def search(self, sequence):
+        """
+        Scan one sequence and report every motif occurrence.
+
+        Args:
+            sequence (str or bytes): Sequence to scan
+
+        Returns:
+            list: MotifHit(motif, strand, position) tuples, with position the
+                0-based start of the match on the forward strand
+        """
+        if isinstance(sequence, str):
+            sequence = sequence.encode('ascii')
+        delta = self._delta
+        outputs = self._outputs
+        hits = []
+        state = 0
+        for index, symbol in enumerate(sequence.translate(_SYMBOLS)):
+            state = delta[state * _ALPHABET_SIZE + symbol]
+            if outputs[state]:
+                for name, strand, length in outputs[state]:
+                    hits.append(MotifHit(name, strand, index - length + 1))
+        return hits
+
+
+def find_motifs(sequence, motifs, both_strands=True):
+    """
+    Find all occurrences of many motifs in a sequence.
+
+    Args:
+        sequence (str or bytes): Sequence to scan
+        motifs (MotifAutomaton, dict or list): Compiled automaton, or
+            motifs to compile (compile once and reuse for many sequences)
+        both_strands (bool): Also search the reverse strand (default: True)
+
+    Returns:
+        list: MotifHit(motif, strand, position) tuples
+    """
+    if not isinstance(motifs, MotifAutomaton):
+        motifs = MotifAutomaton(motifs, both_strands=both_strands)
+    return motifs.search(sequence)
@@ -0,0 +1,146 @@
+"""Proteome-wide amino-acid composition and protein properties"""
+
+import numpy as np
+
+from ..io.readers import iter_fasta
+from ..utils.encoding import as_buffer
+
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+_OTHER = len(AMINO_ACIDS)
+
+# Residue byte -> column 0-19 (either case), anything else -> 20 ("other")
+_RESIDUE_CODES = np.full(256, _OTHER, dtype=np.int64)
+for _index, _residue in enumerate(AMINO_ACIDS):
+    _RESIDUE_CODES[ord(_residue)] = _RESIDUE_CODES[ord(_residue.lower())] = _index
+
+# Average masses of free amino acids (Da); a peptide loses one water per bond
+_AMINO_ACID_MASS = {
+    'A': 89.0932, 'C': 121.1582, 'D': 133.1027, 'E': 147.1293, 'F': 165.1891,
+    'G': 75.0666, 'H': 155.1546, 'I': 131.1729, 'K': 146.1876, 'L': 131.1729,
+    'M': 149.2113, 'N': 132.1179, 'P': 115.1305, 'Q': 146.1445, 'R': 174.201,
+    'S': 105.0926, 'T': 119.1192, 'V': 117.1463, 'W': 204.2252, 'Y': 181.1885,
+}
+_WATER_MASS = 18.01528
+
+# Kyte-Doolittle hydropathy
+_HYDROPATHY = {
+    'A': 1.8, 'C': 2.5, 'D': -3.5, 'E': -3.5, 'F': 2.8, 'G': -0.4, 'H': -3.2,
+    'I': 4.5, 'K': -3.9, 'L': 3.8, 'M': 1.9, 'N': -3.5, 'P': -1.6, 'Q': -3.5,
+    'R': -4.5, 'S': -0.8, 'T': -0.7, 'V': 4.2, 'W': -0.9, 'Y': -1.3,
+}
+
+# EMBOSS pKa values for ionisable side chains and termini
+_POSITIVE_PKA = {'K': 10.8, 'R': 12.5, 'H': 6.5}
+_NEGATIVE_PKA = {'D': 3.9, 'E': 4.1, 'C': 8.5, 'Y': 10.1}
+_N_TERMINUS_PKA = 8.6
+_C_TERMINUS_PKA = 3.6
+
+_MASS_VECTOR = np.array([_AMINO_ACID_MASS[residue] for residue in AMINO_ACIDS])
+_HYDROPATHY_VECTOR = np.array([_HYDROPATHY[residue] for residue in AMINO_ACIDS])
+
+
+def composition_matrix(sequences, offsets=None):
+    """
+    Count the 20 standard amino acids in every protein with one bincount.
+
+    Each residue is mapped to a column with a lookup table, combined with
+    its protein index into a single flat bin, and counted in one
+    np.bincount call over the whole packed proteome.
+
+    Args:
+        sequences (list or buffer): Protein sequences, or one concatenated
+            buffer when offsets is given
+        offsets (array): n + 1 boundaries into the buffer (default: None)
+
+    Returns:
+        tuple: (counts, other) where counts is an (n, 20) int64 matrix in
+            AMINO_ACIDS column order and other holds per-protein counts of
+            anything else (X, B, Z, U, O, '*', ...)
+    """
+    buffer, offsets = as_buffer(sequences, offsets)
+    buffer = buffer[offsets[0]:offsets[-1]]
+    offsets = offsets - offsets[0]
+    n_proteins = len(offsets) - 1
+    protein_index = np.repeat(np.arange(n_proteins, dtype=np.int64), np.diff(offsets))
+    bins = protein_index * (_OTHER + 1) + _RESIDUE_CODES[buffer]
+    counts = np.bincount(bins, minlength=n_proteins * (_OTHER + 1)).reshape(n_proteins, _OTHER + 1)
+    return counts[:, :_OTHER], counts[:, _OTHER]
+
+
+def _net_charge(counts, ph):
+    """Net charge of every protein at per-protein pH values (Henderson-Hasselbalch)."""
+    charge = 1.0 / (1.0 + 10.0 ** (ph - _N_TERMINUS_PKA))
+    charge -= 1.0 / (1.0 + 10.0 ** (_C_TERMINUS_PKA - ph))
+    for residue, pka in _POSITIVE_PKA.items():
+        charge += counts[:, AMINO_ACIDS.index(residue)] / (1.0 + 10.0 ** (ph - pka))
+    for residue, pka in _NEGATIVE_PKA.items():
+        charge -= counts[:, AMINO_ACIDS.index(residue)] / (1.0 + 10.0 ** (pka - ph))
+    return charge
+
+
+def isoelectric_points(counts, iterations=40):
+    """
+    Isoelectric point of every protein from its composition counts.
+
+    All proteins are bisected together on pH 0-14 (net charge falls
+    monotonically with pH), so the cost is a fixed number of array passes.
+    """
+    low = np.zeros(len(counts))
+    high = np.full(len(counts), 14.0)
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        positive = _net_charge(counts, middle) > 0
+        low = np.where(positive, middle, low)
+        high = np.where(positive, high, middle)
+    return (low + high) / 2
+
+
+def protein_properties(sequences, offsets=None):
+    """
+    Composition, molecular weight, isoelectric point and GRAVY per protein.
+
+    Every property is derived from the composition matrix with array
+    operations. Non-standard residues are left out of all properties.
+
+    Args:
+        sequences (list or buffer): Protein sequences, or one concatenated
+            buffer when offsets is given
+        offsets (array): n + 1 boundaries into the buffer (default: None)
+
+    Returns:
+        dict: 'composition' (n, 20) counts, 'other', 'length' (standard
+            residues), 'molecular_weight' (Da), 'isoelectric_point' and
+            'gravy' arrays; MW and GRAVY are NaN for empty proteins
+    """
+    counts, other = composition_matrix(sequences, offsets)
+    lengths = counts.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        molecular_weight = np.where(
+            lengths > 0, counts @ _MASS_VECTOR - (lengths - 1) * _WATER_MASS, np.nan)
+        gravy = (counts @ _HYDROPATHY_VECTOR) / lengths
+    return {
+        'composition': counts,
+        'other': other,
+        'length': lengths,
+        'molecular_weight': molecular_weight,
+        'isoelectric_point': isoelectric_points(counts),
+        'gravy': gravy,
+    }
+
+
+def proteome_properties(filename):
+    """
+    Characterize every protein in a FASTA file.
+
+    Args:
+        filename (str): Path to protein FASTA (plain, gzip or BGZF)
+
+    Returns:
+        tuple: (ids, properties) where ids lists record ids in file order
+            and properties is the dict from protein_properties
+    """
+    ids, sequences = [], []
+    for record_id, _, sequence in iter_fasta(filename, as_bytes=True):
+        ids.append(record_id.decode('ascii'))
+        sequences.append(sequence)
+    return ids, protein_properties(sequences)
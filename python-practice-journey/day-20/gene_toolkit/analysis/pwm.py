@@ -0,0 +1,222 @@
+"""Position weight matrix (log-odds) scanning on both strands"""
+
+from collections import namedtuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..core.genetic_code import BASE_CODES
+from ..utils.encoding import as_uint8
+
+PWMHit = namedtuple('PWMHit', ['motif', 'strand', 'position', 'score'])
+
+# One-hot rows per 2-bit code; code 4 (N or other) scores as all zeros
+_ONE_HOT_ROWS = np.vstack([np.eye(4, dtype=np.float32), np.zeros((1, 4), dtype=np.float32)])
+
+# Sequence windows scored per matrix multiplication (bounds peak memory)
+_WINDOW_BLOCK = 65536
+
+
+def one_hot(sequence):
+    """
+    One-hot encode a sequence as an (n, 4) float32 array in ACGT order.
+
+    N and other ambiguous bases become all-zero rows.
+    """
+    return _ONE_HOT_ROWS[BASE_CODES[as_uint8(sequence)]]
+
+
+class PWM:
+    """
+    Log-odds position weight matrix.
+
+    Scores are log2(p(base at position) / p(base in background)), so a
+    window's score is the sum of one matrix entry per position.
+    """
+
+    def __init__(self, name, log_odds, background=(0.25, 0.25, 0.25, 0.25)):
+        """
+        Args:
+            name (str): Motif name
+            log_odds (array): (length, 4) log-odds matrix in ACGT order
+            background (tuple): Background base frequencies (default: uniform)
+        """
+        self.name = name
+        self.log_odds = np.asarray(log_odds, dtype=np.float64)
+        self.background = np.asarray(background, dtype=np.float64)
+        self._thresholds = {}
+
+    @classmethod
+    def from_counts(cls, name, counts, pseudocount=0.8, background=(0.25, 0.25, 0.25, 0.25)):
+        """
+        Build a PWM from a count (or frequency) matrix.
+
+        Args:
+            name (str): Motif name
+            counts (array): (length, 4) counts in ACGT order; a (4, length)
+                matrix as stored in JASPAR files is transposed automatically
+            pseudocount (float): Total pseudocount per position (default: 0.8)
+            background (tuple): Background base frequencies (default: uniform)
+
+        Returns:
+            PWM: The log-odds matrix
+        """
+        counts = np.asarray(counts, dtype=np.float64)
+        if counts.shape[1] != 4 and counts.shape[0] == 4:
+            counts = counts.T
+        background = np.asarray(background, dtype=np.float64)
+        totals = counts.sum(axis=1, keepdims=True)
+        probabilities = (counts + pseudocount * background) / (totals + pseudocount)
+        return cls(name, np.log2(probabilities / background), background)
+
+    def __len__(self):
+        return len(self.log_odds)
+
+    def __repr__(self):
+        return f"PWM({self.name!r}, length={len(self)})"
+
+    def reverse_complement(self):
+        """Matrix that scores the reverse strand when slid along the forward strand."""
+        return PWM(self.name, self.log_odds[::-1, ::-1], self.background[::-1])
+
+    @property
+    def max_score(self):
+        return float(self.log_odds.max(axis=1).sum())
+
+    @property
+    def min_score(self):
+        return float(self.log_odds.min(axis=1).sum())
+
+    def threshold(self, pvalue, resolution=0.001):
+        """
+        Score cutoff whose background p-value is at most pvalue.
+
+        The exact score distribution under the background model is built
+        by dynamic programming over scores rounded to resolution bits.
+
+        Args:
+            pvalue (float): Maximum probability of a background window
+                scoring at or above the cutoff
+            resolution (float): Score rounding step in bits (default: 0.001)
+
+        Returns:
+            float: Score cutoff
+        """
+        key = (pvalue, resolution)
+        if key in self._thresholds:
+            return self._thresholds[key]
+
+        steps = np.round(self.log_odds / resolution).astype(np.int64)
+        offset = steps.min(axis=1)
+        steps -= offset[:, None]
+        distribution = np.ones(1)
+        for position in range(len(steps)):
+            next_distribution = np.zeros(len(distribution) + steps[position].max())
+            for base in range(4):
+                shift = steps[position, base]
+                next_distribution[shift:shift + len(distribution)] += (
+                    distribution * self.background[base])
+            distribution = next_distribution
+
+        # survival[i] = P(score >= i steps above the minimum)
+        survival = np.cumsum(distribution[::-1])[::-1]
+        index = int(np.argmax(survival <= pvalue)) if survival[-1] <= pvalue else len(survival)
+        cutoff = (index + offset.sum()) * resolution
+        self._thresholds[key] = cutoff
+        return cutoff
+
+
+def read_jaspar(filename, pseudocount=0.8, background=(0.25, 0.25, 0.25, 0.25)):
+    """
+    Read count matrices in JASPAR format into PWMs.
+
+    Expects '>ID name' headers followed by four rows such as
+    'A  [ 4 19  0 ... ]' (brackets optional).
+
+    Args:
+        filename (str): Path to JASPAR file
+        pseudocount (float): See PWM.from_counts (default: 0.8)
+        background (tuple): Background base frequencies (default: uniform)
+
+    Returns:
+        list: PWM objects in file order
+    """
+    pwms = []
+    name, rows = None, {}
+    with open(filename, 'r') as f:
+        for line in list(f) + ['>']:
+            line = line.strip()
+            if line.startswith('>'):
+                if name is not None:
+                    counts = np.array([rows[base] for base in 'ACGT'])
+                    pwms.append(PWM.from_counts(name, counts, pseudocount, background))
+                name, rows = line[1:].strip(), {}
+            elif line:
+                base, values = line[0].upper(), line[1:].replace('[', ' ').replace(']', ' ')
+                rows[base] = [float(value) for value in values.split()]
+    return pwms
+
+
+def _score_block(windows, weights):
+    """Score a block of (n, 4, length) windows against stacked (4 * length, m) weights."""
+    flat = windows.transpose(0, 2, 1).reshape(len(windows), -1)
+    return flat @ weights
+
+
+def scan_pwms(sequence, pwms, pvalue=1e-4, both_strands=True, min_scores=None):
+    """
+    Scan a sequence with many PWMs and report windows above threshold.
+
+    The sequence is one-hot encoded once. PWMs of equal length (and their
+    reverse complements) are stacked into one weight matrix and all
+    windows are scored with block-wise matrix multiplication, so the
+    encoded sequence is reused across every motif.
+
+    Args:
+        sequence (str or bytes): Sequence to scan
+        pwms (list): PWM objects (e.g. from read_jaspar)
+        pvalue (float): Background p-value cutoff per PWM (default: 1e-4)
+        both_strands (bool): Also score the reverse strand (default: True)
+        min_scores (dict): Optional PWM name to fixed score cutoff,
+            overriding pvalue for those PWMs
+
+    Returns:
+        list: PWMHit(motif, strand, position, score) tuples sorted by
+            position, with position the 0-based window start on the
+            forward strand
+    """
+    encoded = one_hot(sequence)
+    min_scores = min_scores or {}
+    hits = []
+
+    by_length = {}
+    for pwm in pwms:
+        by_length.setdefault(len(pwm), []).append(pwm)
+
+    for length, group in by_length.items():
+        if len(encoded) < length:
+            continue
+        columns, labels = [], []
+        for pwm in group:
+            cutoff = min_scores.get(pwm.name)
+            if cutoff is None:
+                cutoff = pwm.threshold(pvalue)
+            columns.append(pwm.log_odds)
+            labels.append((pwm.name, '+', cutoff))
+            if both_strands:
+                columns.append(pwm.reverse_complement().log_odds)
+                labels.append((pwm.name, '-', cutoff))
+        weights = np.stack([matrix.reshape(-1) for matrix in columns], axis=1).astype(np.float32)
+        cutoffs = np.array([label[2] for label in labels], dtype=np.float32) - 1e-4
+
+        windows = sliding_window_view(encoded, length, axis=0)
+        for block_start in range(0, len(windows), _WINDOW_BLOCK):
+            scores = _score_block(windows[block_start:block_start + _WINDOW_BLOCK], weights)
+            positions, columns_hit = np.nonzero(scores >= cutoffs)
+            for position, column in zip(positions.tolist(), columns_hit.tolist()):
+                name, strand, _ = labels[column]
+                hits.append(PWMHit(name, strand, block_start + position,
+                                   float(scores[position, column])))
+
+    hits.sort(key=lambda hit: (hit.position, hit.motif, hit.strand))
+    return hits
@@ -0,0 +1,246 @@
+"""FastQC-style per-base and per-read quality statistics in NumPy"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ..core.genetic_code import BASE_CODES
+from ..io.compression import is_gzip
+from ..io.readers import iter_fastq_blocks
+from ..utils.encoding import fastq_line_roles, pack_sequences, segment_sums, translate_buffer
+from ..utils.parallel import shard_ranges
+
+MAX_QUALITY = 93
+BASES = ['A', 'C', 'G', 'T', 'N']
+
+
+def _grow(array, length):
+    """Pad the first axis of a per-position table with zero rows."""
+    if len(array) >= length:
+        return array
+    extra = np.zeros((length - len(array),) + array.shape[1:], dtype=array.dtype)
+    return np.concatenate([array, extra])
+
+
+def _position_histogram(values, bins, positions, width):
+    """(width, bins) counts of values by read position, via one np.bincount."""
+    counts = np.bincount((positions * bins + values).ravel(), minlength=width * bins)
+    return counts.reshape(width, bins)
+
+
+class QualityStats:
+    """
+    Mergeable accumulator of FastQC-style FASTQ statistics.
+
+    Quality and sequence bytes of a batch are pulled out of the file
+    buffer as flat uint8 arrays. When all reads have the same length they
+    are viewed as (reads x position) matrices by a reshape; otherwise each
+    byte is tagged with its position in the read. Per-position quality
+    histograms and base counts then come from one np.bincount each, and
+    per-read mean quality and GC from row or segment sums. Only
+    histograms are kept, so memory does not grow with the number of
+    reads, and statistics from separate shards or processes add up
+    exactly with merge().
+
+    Usage:
+        stats = fastq_quality_stats('sample_R1.fastq.gz')
+        stats.save_json('sample_R1.qc.json')
+    """
+
+    def __init__(self, phred_offset=33):
+        """
+        Args:
+            phred_offset (int): Quality encoding offset (default: 33)
+        """
+        self.phred_offset = phred_offset
+        self.reads = 0
+        self.position_quality = np.zeros((0, MAX_QUALITY + 1), dtype=np.int64)
+        self.position_bases = np.zeros((0, len(BASES)), dtype=np.int64)
+        self.read_quality = np.zeros(MAX_QUALITY + 1, dtype=np.int64)
+        self.read_gc = np.zeros(101, dtype=np.int64)
+        self.lengths = np.zeros(0, dtype=np.int64)
+
+    def add(self, sequences, qualities):
+        """
+        Accumulate a batch of reads, e.g. collected from iter_fastq.
+
+        Args:
+            sequences (list): Read sequences as str or bytes
+            qualities (list): Quality strings, same lengths as the reads
+        """
+        sequence_buffer, offsets = pack_sequences(sequences)
+        quality_buffer, quality_offsets = pack_sequences(qualities)
+        if not np.array_equal(offsets, quality_offsets):
+            raise ValueError("Sequence and quality lengths differ")
+        self._add_packed(translate_buffer(sequence_buffer, BASE_CODES), quality_buffer, offsets)
+
+    def _add_packed(self, bases, qualities, offsets):
+        """Accumulate concatenated base codes and raw quality bytes."""
+        lengths = np.diff(offsets)
+        if not len(lengths):
+            return
+        low, high = self.phred_offset, self.phred_offset + MAX_QUALITY
+        if len(qualities) and (qualities.min() < low or qualities.max() > high):
+            raise ValueError(f"Quality characters outside Phred+{low} 0-93; check phred_offset")
+        qualities = qualities - np.uint8(low)
+        width = int(lengths.max())
+        self.position_quality = _grow(self.position_quality, width)
+        self.position_bases = _grow(self.position_bases, width)
+        self.lengths = _grow(self.lengths, width + 1)
+        is_gc = ((bases - np.uint8(1)) < 2).view(np.uint8)   # codes 1 (C) and 2 (G); uint8 wraps
+
+        if width and lengths.min() == width:
+            # Equal lengths: the reads x position matrices are plain reshapes
+            qualities = qualities.reshape(-1, width)
+            bases = bases.reshape(-1, width)
+            positions = np.arange(width, dtype=np.int64)
+            quality_sums = qualities.sum(axis=1, dtype=np.int64)
+            gc = is_gc.reshape(-1, width).sum(axis=1, dtype=np.int64)
+        else:
+            positions = np.arange(len(qualities), dtype=np.int64)
+            positions -= np.repeat(offsets[:-1], lengths)
+            quality_sums = segment_sums(qualities, offsets)
+            gc = segment_sums(is_gc, offsets)
+
+        if width:
+            self.position_quality[:width] += _position_histogram(qualities, MAX_QUALITY + 1,
+                                                                 positions, width)
+            self.position_bases[:width] += _position_histogram(bases, len(BASES), positions, width)
+        safe_lengths = np.maximum(lengths, 1)
+        self.read_quality += np.bincount(quality_sums // safe_lengths, minlength=MAX_QUALITY + 1)
+        self.read_gc += np.bincount(np.rint(100 * gc / safe_lengths).astype(np.int64),
+                                    minlength=101)
+        self.lengths += np.bincount(lengths, minlength=len(self.lengths))
+        self.reads += len(lengths)
+
+    def add_block(self, buffer):
+        """
+        Accumulate a bytes block of whole four-line FASTQ records.
+
+        Every byte is tagged with its line's role by fastq_line_roles, and
+        boolean masks then pull all sequence and all quality bytes out of
+        the buffer in one pass each.
+        """
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        starts, ends, content_ends, role = fastq_line_roles(data)
+        if len(ends) % 4:
+            raise ValueError("FASTQ block does not hold whole four-line records")
+        lengths = content_ends[3::4] - starts[3::4]
+        if np.any(lengths != content_ends[1::4] - starts[1::4]):
+            raise ValueError("Sequence and quality lengths differ; run validate_fastq")
+
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        self._add_packed(translate_buffer(data[role == 1], BASE_CODES), data[role == 3], offsets)
+
+    def merge(self, other):
+        """Add the statistics of another QualityStats (same phred_offset)."""
+        if other.phred_offset != self.phred_offset:
+            raise ValueError("Cannot merge statistics with different phred_offset")
+        self.reads += other.reads
+        for name in ('position_quality', 'position_bases', 'lengths'):
+            mine, theirs = getattr(self, name), getattr(other, name)
+            mine = _grow(mine, len(theirs))
+            mine[:len(theirs)] += theirs
+            setattr(self, name, mine)
+        self.read_quality += other.read_quality
+        self.read_gc += other.read_gc
+
+    def _quality_percentiles(self, fractions):
+        counts = self.position_quality
+        totals = counts.sum(axis=1, keepdims=True)
+        cumulative = counts.cumsum(axis=1)
+        return [(cumulative < fraction * totals).sum(axis=1) for fraction in fractions]
+
+    def to_dict(self):
+        """
+        Summarise as a JSON-serialisable dict of FastQC modules.
+
+        Returns:
+            dict: 'reads', 'bases', 'per_base_quality' (mean, median,
+                quartiles and 10th/90th percentiles per 1-based position),
+                'per_sequence_quality', 'per_base_content' (percent per
+                base), 'per_base_n_content', 'per_sequence_gc' and
+                'length_distribution' ({value: count} maps skip zeros)
+        """
+        counts = self.position_quality
+        totals = counts.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = counts @ np.arange(MAX_QUALITY + 1) / totals
+            content = 100 * self.position_bases / self.position_bases.sum(axis=1, keepdims=True)
+        p10, q1, median, q3, p90 = self._quality_percentiles((0.1, 0.25, 0.5, 0.75, 0.9))
+
+        def nonzero(histogram):
+            return {int(value): int(histogram[value]) for value in np.flatnonzero(histogram)}
+
+        return {
+            'reads': int(self.reads),
+            'bases': int(totals.sum()),
+            'phred_offset': self.phred_offset,
+            'per_base_quality': {
+                'position': list(range(1, len(counts) + 1)),
+                'mean': np.round(mean, 3).tolist(),
+                'median': median.tolist(),
+                'lower_quartile': q1.tolist(),
+                'upper_quartile': q3.tolist(),
+                'percentile_10': p10.tolist(),
+                'percentile_90': p90.tolist(),
+                'reads_covering': totals.tolist(),
+            },
+            'per_sequence_quality': nonzero(self.read_quality),
+            'per_base_content': {base: np.round(content[:, i], 3).tolist()
+                                 for i, base in enumerate(BASES[:4])},
+            'per_base_n_content': np.round(content[:, 4], 3).tolist(),
+            'per_sequence_gc': self.read_gc.tolist(),
+            'length_distribution': nonzero(self.lengths),
+        }
+
+    def save_json(self, filename):
+        """Write to_dict() as JSON."""
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+
+def _shard_stats(filename, phred_offset, chunk_size, start, end):
+    """Worker: statistics for one byte range of a FASTQ file."""
+    stats = QualityStats(phred_offset)
+    for block in iter_fastq_blocks(filename, chunk_size, start, end):
+        stats.add_block(block)
+    return stats
+
+
+def fastq_quality_stats(filename, phred_offset=33, workers=1, shards_per_worker=4,
+                        chunk_size=1 << 24):
+    """
+    Compute FastQC-style statistics for a FASTQ file in one pass.
+
+    With workers > 1 an uncompressed file is cut into record-aligned byte
+    ranges (shard_ranges) and each worker process reads its own ranges;
+    the per-shard histograms are merged at the end. Compressed files are
+    read as a single shard.
+
+    Args:
+        filename (str): FASTQ file (plain, gzip or BGZF)
+        phred_offset (int): Quality encoding offset (default: 33)
+        workers (int): Worker processes (default: 1)
+        shards_per_worker (int): Shards per worker for load balancing
+            (default: 4)
+        chunk_size (int): Bytes read per block (default: 16 MB)
+
+    Returns:
+        QualityStats: Accumulated statistics; call to_dict() or save_json()
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or is_gzip(filename):
+        return _shard_stats(filename, phred_offset, chunk_size, 0, None)
+
+    ranges = shard_ranges(filename, workers * shards_per_worker, 'fastq')
+    stats = QualityStats(phred_offset)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_shard_stats, filename, phred_offset, chunk_size, start, end)
+                   for start, end in ranges]
+        for future in futures:
+            stats.merge(future.result())
+    return stats
@@ -0,0 +1,284 @@
+"""MinHash and FracMinHash sketches of canonical k-mers"""
+
+import math
+
+import numpy as np
+
+from ..io.readers import iter_fasta
+from .kmers import MAX_K, kmer_array
+
+MAX_HASH = np.iinfo(np.uint64).max
+
+# Long records are hashed in slices to bound the size of the k-mer array
+_SLICE_SIZE = 1 << 22
+
+
+def hash_kmers(kmers, seed=42):
+    """
+    Hash packed k-mers with the 64-bit MurmurHash3 finalizer.
+
+    Args:
+        kmers (numpy.ndarray): uint64 k-mer codes from kmer_array
+        seed (int): Hash seed; sketches compare only with the same seed
+
+    Returns:
+        numpy.ndarray: uint64 hashes
+    """
+    # uint64 arithmetic wraps around, which is what the mixer relies on
+    h = kmers ^ np.uint64(seed)
+    h ^= h >> np.uint64(33)
+    h *= np.uint64(0xff51afd7ed558ccd)
+    h ^= h >> np.uint64(33)
+    h *= np.uint64(0xc4ceb9fe1a85ec53)
+    h ^= h >> np.uint64(33)
+    return h
+
+
+class MinHash:
+    """
+    Bottom-k (num) or FracMinHash (scaled) sketch of canonical k-mers.
+
+    A num sketch keeps the num smallest hashes; a scaled sketch keeps
+    every hash below 2**64 / scaled, so it grows with the genome and
+    supports containment between sets of very different sizes. Hashes are
+    stored as a sorted unique uint64 array.
+
+    Usage:
+        a = MinHash(k=21, num=1000, name='sample_a')
+        a.add_fasta('sample_a.fasta')
+        a.jaccard(b), a.containment(b), a.ani(b)
+    """
+
+    def __init__(self, k=21, num=1000, scaled=None, seed=42, name=''):
+        """
+        Args:
+            k (int): k-mer size, 1 to 31 (default: 21)
+            num (int): Sketch size for bottom-k sketches (default: 1000)
+            scaled (int): Keep 1/scaled of all hashes instead of a fixed
+                number; overrides num (default: None)
+            seed (int): Hash seed (default: 42)
+            name (str): Label used in comparisons and saved files
+        """
+        if not 1 <= k <= MAX_K:
+            raise ValueError(f"k must be between 1 and {MAX_K}")
+        if scaled is None and num < 1:
+            raise ValueError("num must be at least 1")
+        if scaled is not None and scaled < 1:
+            raise ValueError("scaled must be at least 1")
+        self.k = k
+        self.num = 0 if scaled else num
+        self.scaled = scaled or 0
+        self.seed = seed
+        self.name = name
+        self.hashes = np.zeros(0, dtype=np.uint64)
+
+    @property
+    def max_hash(self):
+        """Largest hash a scaled sketch keeps (MAX_HASH for num sketches)."""
+        if self.scaled:
+            return np.uint64(int(MAX_HASH) // self.scaled)
+        return MAX_HASH
+
+    @property
+    def cap(self):
+        """Hash value up to which the sketch holds every k-mer hash."""
+        if self.num and len(self.hashes) >= self.num:
+            return self.hashes[-1]
+        return self.max_hash
+
+    def add_hashes(self, hashes):
+        """Merge precomputed hashes into the sketch."""
+        hashes = hashes[hashes <= self.cap]
+        if not len(hashes):
+            return
+        merged = np.unique(np.concatenate([self.hashes, hashes]))
+        self.hashes = merged[:self.num] if self.num else merged
+
+    def add(self, sequence):
+        """Add the canonical k-mers of one sequence (k-mers with N are skipped)."""
+        overlap = self.k - 1
+        for start in range(0, max(len(sequence) - overlap, 1), _SLICE_SIZE):
+            piece = sequence[start:start + _SLICE_SIZE + overlap]
+            self.add_hashes(hash_kmers(kmer_array(piece, self.k), self.seed))
+
+    def add_fasta(self, filename):
+        """Add every record of a FASTA file."""
+        for _, _, sequence in iter_fasta(filename, as_bytes=True):
+            self.add(sequence)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def _check_compatible(self, other):
+        if (other.k, other.seed) != (self.k, self.seed):
+            raise ValueError("Cannot compare sketches with different k or seed")
+        if bool(other.scaled) != bool(self.scaled):
+            raise ValueError("Cannot compare a num sketch with a scaled sketch")
+
+    def _overlap(self, other):
+        """Shared and per-sketch hash counts, both cut at the common cap."""
+        self._check_compatible(other)
+        cap = min(self.cap, other.cap)
+        size_a = int(np.searchsorted(self.hashes, cap, side='right'))
+        size_b = int(np.searchsorted(other.hashes, cap, side='right'))
+        shared = len(np.intersect1d(self.hashes[:size_a], other.hashes[:size_b],
+                                    assume_unique=True))
+        return shared, size_a, size_b
+
+    def jaccard(self, other):
+        """Estimated Jaccard index of the two k-mer sets."""
+        shared, size_a, size_b = self._overlap(other)
+        union = size_a + size_b - shared
+        return shared / union if union else 0.0
+
+    def containment(self, other):
+        """Estimated fraction of this sketch's k-mers found in other."""
+        shared, size_a, _ = self._overlap(other)
+        return shared / size_a if size_a else 0.0
+
+    def ani(self, other, from_containment=False):
+        """
+        Estimated average nucleotide identity.
+
+        Uses the Mash distance 1 + ln(2J / (1 + J)) / k by default, or
+        C ** (1 / k) from containment when the genomes differ a lot in size.
+        """
+        if from_containment:
+            return containment_ani(self.containment(other), self.k)
+        return jaccard_ani(self.jaccard(other), self.k)
+
+    def save(self, filename):
+        """Write the sketch to a small .npz file."""
+        np.savez(filename, hashes=self.hashes, k=self.k, num=self.num,
+                 scaled=self.scaled, seed=self.seed, name=self.name)
+
+    @classmethod
+    def load(cls, filename):
+        """Read a sketch written by save()."""
+        with np.load(filename) as data:
+            sketch = cls(int(data['k']), int(data['num']), int(data['scaled']) or None,
+                         int(data['seed']), str(data['name']))
+            sketch.hashes = data['hashes']
+        return sketch
+
+
+def jaccard_ani(jaccard, k):
+    """ANI from a Jaccard estimate via the Mash distance (0 when J is 0)."""
+    if jaccard <= 0:
+        return 0.0
+    return max(1 + math.log(2 * jaccard / (1 + jaccard)) / k, 0.0)
+
+
+def containment_ani(containment, k):
+    """ANI from a containment estimate, C ** (1 / k)."""
+    return containment ** (1 / k) if containment > 0 else 0.0
+
+
+def sketch_fasta(filename, k=21, num=1000, scaled=None, seed=42, per_record=False):
+    """
+    Sketch a FASTA file as a whole or one record at a time.
+
+    Args:
+        filename (str): FASTA file (plain, gzip or BGZF)
+        k, num, scaled, seed: Sketch settings, see MinHash
+        per_record (bool): Return one sketch per record (default: False)
+
+    Returns:
+        MinHash or list: One sketch named after the file, or a list of
+            sketches named after the record IDs
+    """
+    if not per_record:
+        sketch = MinHash(k, num, scaled, seed, name=filename)
+        sketch.add_fasta(filename)
+        return sketch
+    sketches = []
+    for seq_id, _, sequence in iter_fasta(filename, as_bytes=True):
+        sketch = MinHash(k, num, scaled, seed, name=seq_id.decode('ascii'))
+        sketch.add(sequence)
+        sketches.append(sketch)
+    return sketches
+
+
+def _shared_counts(sketches, batch_size):
+    """
+    Count shared hashes for every pair of sketches.
+
+    All (hash, sketch) entries are sorted once, so sketches sharing a hash
+    sit next to each other; the pairs inside each run are expanded with
+    array arithmetic and tallied with np.bincount, in batches that bound
+    memory.
+    """
+    n = len(sketches)
+    hashes = np.concatenate([sketch.hashes for sketch in sketches])
+    owners = np.repeat(np.arange(n, dtype=np.int64), [len(sketch) for sketch in sketches])
+    order = np.argsort(hashes, kind='stable')
+    hashes, owners = hashes[order], owners[order]
+
+    run_starts = np.flatnonzero(np.concatenate([[True], hashes[1:] != hashes[:-1]]))
+    run_ends = np.append(run_starts[1:], len(hashes))
+    run_ends = np.repeat(run_ends, run_ends - run_starts)
+    # Each entry pairs with the later entries of its run
+    partners = run_ends - np.arange(len(hashes)) - 1
+
+    shared = np.zeros(n * n, dtype=np.int64)
+    cumulative = np.cumsum(partners)
+    start = 0
+    while start < len(hashes):
+        stop = int(np.searchsorted(cumulative, cumulative[start] - partners[start] + batch_size,
+                                   side='right'))
+        stop = max(stop, start + 1)
+        counts = partners[start:stop]
+        left = np.repeat(np.arange(start, stop), counts)
+        within = np.arange(len(left)) - np.repeat(np.cumsum(counts) - counts, counts)
+        right = left + 1 + within
+        shared += np.bincount(owners[left] * n + owners[right], minlength=n * n)
+        start = stop
+    shared = shared.reshape(n, n)
+    shared += shared.T
+    shared[np.diag_indices(n)] = [len(sketch) for sketch in sketches]
+    return shared
+
+
+def compare_sketches(sketches, metric='jaccard', batch_size=10000000):
+    """
+    All-vs-all comparison matrix.
+
+    Pair sizes are cut at the smaller of the two sketches' caps, as in
+    MinHash.jaccard, so the matrix matches the pairwise methods exactly.
+
+    Args:
+        sketches (list): Compatible MinHash sketches
+        metric (str): 'jaccard', 'containment' (row sketch in column
+            sketch), 'ani' or 'containment_ani' (default: 'jaccard')
+        batch_size (int): Sketch pairs expanded per batch (default: 10M)
+
+    Returns:
+        numpy.ndarray: (n, n) float64 matrix
+    """
+    if metric not in ('jaccard', 'containment', 'ani', 'containment_ani'):
+        raise ValueError(f"Unknown metric: {metric}")
+    if not sketches:
+        return np.zeros((0, 0))
+    for sketch in sketches[1:]:
+        sketches[0]._check_compatible(sketch)
+
+    shared = _shared_counts(sketches, batch_size)
+    caps = np.array([sketch.cap for sketch in sketches], dtype=np.uint64)
+    pair_caps = np.minimum(caps[:, None], caps[None, :])
+    # sizes[i, j]: hashes of sketch i at or below the cap of pair (i, j)
+    sizes = np.stack([np.searchsorted(sketch.hashes, pair_caps[i], side='right')
+                      for i, sketch in enumerate(sketches)])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if metric.startswith('containment'):
+            values = np.where(sizes > 0, shared / sizes, 0.0)
+            if metric == 'containment_ani':
+                values = np.where(values > 0, values ** (1 / sketches[0].k), 0.0)
+            return values
+        union = sizes + sizes.T - shared
+        values = np.where(union > 0, shared / union, 0.0)
+        if metric == 'ani':
+            k = sketches[0].k
+            values = np.where(values > 0, np.maximum(1 + np.log(2 * values / (1 + values)) / k, 0),
+                              0.0)
+        return values
@@ -0,0 +1,10 @@
+"""Core sequence operations and analysis"""
+
+from .._lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    '.sequence': ['reverse_complement', 'reverse_complement_batch', 'translate',
+                  'translate_six_frames', 'find_orfs'],
+    '.packed': ['PackedSequence'],
+    '.analysis': ['gc_content', 'gc_content_batch', 'calculate_tm', 'calculate_tm_batch'],
+})
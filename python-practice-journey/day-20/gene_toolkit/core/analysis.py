@@ -0,0 +1,160 @@
+"""Analysis functions"""
+
+import numpy as np
+
+from ..utils.encoding import GC_TABLE, as_buffer, reverse_segments, segment_sums, translate_buffer
+from .genetic_code import BASE_CODES
+
+# 1 for unknown bases (N), used when they should not count toward length
+_N_TABLE = bytes(1 if chr(i) in 'Nn' else 0 for i in range(256))
+
+# SantaLucia (1998) unified nearest-neighbor parameters, in tenths of
+# kcal/mol (dH) and cal/(K mol) (dS), indexed by step 4 * b1 + b2 with
+# A=0, C=1, G=2, T=3. Steps and their reverse complements share values.
+_NN_STEPS = {
+    'AA': (-79, -222), 'TT': (-79, -222),
+    'AT': (-72, -204),
+    'TA': (-72, -213),
+    'CA': (-85, -227), 'TG': (-85, -227),
+    'GT': (-84, -224), 'AC': (-84, -224),
+    'CT': (-78, -210), 'AG': (-78, -210),
+    'GA': (-82, -222), 'TC': (-82, -222),
+    'CG': (-106, -272),
+    'GC': (-98, -244),
+    'GG': (-80, -199), 'CC': (-80, -199),
+}
+_NN_DELTA_H = np.zeros(16, dtype=np.int64)
+_NN_DELTA_S = np.zeros(16, dtype=np.int64)
+for _step, (_dh, _ds) in _NN_STEPS.items():
+    _index = 4 * 'ACGT'.index(_step[0]) + 'ACGT'.index(_step[1])
+    _NN_DELTA_H[_index], _NN_DELTA_S[_index] = _dh, _ds
+
+# Initiation per terminal pair (A/T vs G/C ends) and symmetry correction
+_INIT_DELTA_H = np.array([2.3, 0.1, 0.1, 2.3])
+_INIT_DELTA_S = np.array([4.1, -2.8, -2.8, 4.1])
+_SYMMETRY_DELTA_S = -1.4
+_GAS_CONSTANT = 1.987
+
+
+def gc_content(sequence):
+    """Calculate GC percentage"""
+    sequence = sequence.upper()
+    g = sequence.count('G')
+    c = sequence.count('C')
+    return ((g + c) / len(sequence)) * 100
+
+
+def gc_content_batch(sequences, offsets=None, ignore_n=False):
+    """
+    Calculate GC fractions for many sequences in one vectorized pass.
+
+    Bases are mapped through a 256-entry lookup table with bytes.translate
+    and summed per sequence with np.add.reduceat, so there is no Python
+    loop per read.
+    Lowercase (soft-masked) bases count the same as uppercase.
+
+    Args:
+        sequences (list or buffer): List of str/bytes sequences, or one
+            concatenated bytes/uint8 buffer when offsets is given
+        offsets (array): n + 1 boundaries into the buffer (default: None)
+        ignore_n (bool): Leave N bases out of the denominator (default: False)
+
+    Returns:
+        numpy.ndarray: float64 GC fraction (0-1) per sequence, NaN when a
+            sequence has no countable bases
+    """
+    buffer, offsets = as_buffer(sequences, offsets)
+    buffer = buffer[offsets[0]:offsets[-1]]
+    offsets = offsets - offsets[0]
+    gc = segment_sums(translate_buffer(buffer, GC_TABLE), offsets)
+    lengths = np.diff(offsets)
+    if ignore_n:
+        lengths = lengths - segment_sums(translate_buffer(buffer, _N_TABLE), offsets)
+
+    fractions = np.full(len(lengths), np.nan)
+    np.divide(gc, lengths, out=fractions, where=lengths > 0)
+    return fractions
+
+
+def calculate_tm(sequence, dna_conc=250.0, na=50.0, mg=0.0, dntp=0.0):
+    """
+    Calculate melting temperature with the nearest-neighbor model.
+
+    Single-primer wrapper around calculate_tm_batch; see there for the
+    model and units.
+
+    Returns:
+        float: Melting temperature in degrees Celsius (NaN if the primer is
+            shorter than 2 bases or contains non-ACGT bases)
+    """
+    return float(calculate_tm_batch([sequence], dna_conc=dna_conc, na=na,
+                                    mg=mg, dntp=dntp)[0])
+
+
+def calculate_tm_batch(sequences, offsets=None, dna_conc=250.0, na=50.0, mg=0.0, dntp=0.0):
+    """
+    Calculate nearest-neighbor melting temperatures for many primers.
+
+    Uses the SantaLucia (1998) unified parameters. Every dinucleotide step
+    is encoded as 4 * b1 + b2 and its dH/dS looked up in a 16-entry table,
+    then summed per primer with reduceat, so there is no per-primer loop.
+    Mg2+ is converted to a sodium equivalent (von Ahsen et al. 2001) and
+    the entropy gets the SantaLucia salt correction.
+
+    Args:
+        sequences (list or buffer): Primers as str/bytes, or one
+            concatenated buffer when offsets is given
+        offsets (array): n + 1 boundaries into the buffer (default: None)
+        dna_conc (float): Total strand concentration in nM (default: 250)
+        na (float): Monovalent cation concentration in mM (default: 50)
+        mg (float): Mg2+ concentration in mM (default: 0)
+        dntp (float): dNTP concentration in mM (default: 0)
+
+    Returns:
+        numpy.ndarray: Tm in degrees Celsius per primer, NaN for primers
+            shorter than 2 bases or with non-ACGT bases
+    """
+    buffer, offsets = as_buffer(sequences, offsets)
+    buffer = buffer[offsets[0]:offsets[-1]]
+    offsets = offsets - offsets[0]
+    lengths = np.diff(offsets)
+    codes = BASE_CODES[buffer].astype(np.int64)
+
+    # Dinucleotide step starting at each position; steps that would cross
+    # into the next primer are zeroed out
+    steps = np.zeros(len(codes), dtype=np.int64)
+    steps[:-1] = codes[:-1] * 4 + codes[1:]
+    invalid_step = np.zeros(len(codes), dtype=bool)
+    invalid_step[:-1] = (codes[:-1] > 3) | (codes[1:] > 3)
+    steps[invalid_step] = 0
+    delta_h = _NN_DELTA_H[steps]
+    delta_s = _NN_DELTA_S[steps]
+    last = offsets[1:][lengths > 0] - 1
+    delta_h[last] = 0
+    delta_s[last] = 0
+    delta_h = segment_sums(delta_h, offsets) / 10.0
+    delta_s = segment_sums(delta_s, offsets) / 10.0
+
+    # Initiation for each terminal base pair
+    valid = (lengths >= 2) & (segment_sums((codes > 3).astype(np.uint8), offsets) == 0)
+    first = codes[offsets[:-1][valid]]
+    final = codes[offsets[1:][valid] - 1]
+    delta_h[valid] += _INIT_DELTA_H[first] + _INIT_DELTA_H[final]
+    delta_s[valid] += _INIT_DELTA_S[first] + _INIT_DELTA_S[final]
+
+    # Self-complementary primers: symmetry correction and CT instead of CT/4
+    reverse_complement = 3 - reverse_segments(codes, offsets)
+    self_complementary = segment_sums(
+        (codes != reverse_complement).astype(np.uint8), offsets) == 0
+    delta_s[self_complementary] += _SYMMETRY_DELTA_S
+    strand_factor = np.where(self_complementary, 1.0, 4.0)
+
+    na_equivalent = na + 120.0 * np.sqrt(max(mg - dntp, 0.0))
+    delta_s += 0.368 * (lengths - 1) * np.log(na_equivalent / 1000.0)
+
+    ct = dna_conc * 1e-9
+    tm = np.full(len(lengths), np.nan)
+    tm[valid] = (delta_h[valid] * 1000.0
+                 / (delta_s[valid] + _GAS_CONSTANT * np.log(ct / strand_factor[valid]))
+                 - 273.15)
+    return tm
@@ -0,0 +1,63 @@
+"""NCBI genetic code tables re-indexed for 2-bit encoded codons"""
+
+import numpy as np
+
+# NCBI translation tables, codons listed in TCAG order (TTT, TTC, TTA, ...)
+# https://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi
+NCBI_TABLES = {
+    1: ("Standard",
+        "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "---M------**--*----M---------------M----------------------------"),
+    2: ("Vertebrate Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG",
+        "----------**--------------------MMMM----------**---M------------"),
+    4: ("Mold, Protozoan and Coelenterate Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "--MM------**-------M------------MMMM---------------M------------"),
+    11: ("Bacterial, Archaeal and Plant Plastid",
+         "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "---M------**--*----M------------MMMM---------------M------------"),
+}
+
+# 2-bit base codes: A=0, C=1, G=2, T/U=3, anything else=4 (invalid)
+BASE_CODES = np.full(256, 4, dtype=np.uint8)
+for _code, _bases in enumerate(('Aa', 'Cc', 'Gg', 'TtUu')):
+    for _base in _bases:
+        BASE_CODES[ord(_base)] = _code
+
+# Codon index used for any triple containing an invalid base
+INVALID_CODON = 64
+
+_TCAG_POSITION = {'T': 0, 'C': 1, 'A': 2, 'G': 3}
+_cache = {}
+
+
+def codon_tables(table_id=1):
+    """
+    Return lookup tables for one NCBI genetic code.
+
+    Args:
+        table_id (int): NCBI translation table number (default: 1)
+
+    Returns:
+        tuple: (amino_acids, is_start) as 65-entry NumPy arrays indexed by
+            16 * b1 + 4 * b2 + b3 with A=0, C=1, G=2, T=3; entry 64 is
+            'X' / False for codons with ambiguous bases
+    """
+    if table_id in _cache:
+        return _cache[table_id]
+    if table_id not in NCBI_TABLES:
+        raise ValueError(f"Unsupported genetic code table: {table_id}")
+
+    _, amino_acids_tcag, starts_tcag = NCBI_TABLES[table_id]
+    amino_acids = np.full(65, ord('X'), dtype=np.uint8)
+    is_start = np.zeros(65, dtype=bool)
+    for index in range(64):
+        codon = ('ACGT'[index // 16], 'ACGT'[index // 4 % 4], 'ACGT'[index % 4])
+        ncbi_index = (16 * _TCAG_POSITION[codon[0]] + 4 * _TCAG_POSITION[codon[1]]
+                      + _TCAG_POSITION[codon[2]])
+        amino_acids[index] = ord(amino_acids_tcag[ncbi_index])
+        is_start[index] = starts_tcag[ncbi_index] == 'M'
+
+    _cache[table_id] = (amino_acids, is_start)
+    return amino_acids, is_start
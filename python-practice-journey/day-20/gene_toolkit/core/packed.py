@@ -0,0 +1,209 @@
+"""Compact 2-bit / 4-bit in-memory sequence storage"""
+
+import numpy as np
+
+from ..utils.encoding import as_uint8
+from .genetic_code import BASE_CODES
+
+# 4-bit IUPAC codes as base bitmasks: A=1, C=2, G=4, T=8 (N = all four).
+# Complementing a code is then just reversing its four bits.
+_NIBBLE_LETTERS = '-ACMGRSVTWYHKDBN'
+_NIBBLE_CODES = np.full(256, 255, dtype=np.uint8)
+for _code, _letter in enumerate(_NIBBLE_LETTERS):
+    _NIBBLE_CODES[ord(_letter)] = _code
+    _NIBBLE_CODES[ord(_letter.lower())] = _code
+_NIBBLE_CODES[ord('U')] = _NIBBLE_CODES[ord('u')] = 8
+_NIBBLE_COMPLEMENT = np.array([int(f"{code:04b}"[::-1], 2) for code in range(16)], dtype=np.uint8)
+
+# Per-byte lookup tables for whole packed bytes
+_PACKED_GC_2BIT = np.array([sum(1 for shift in (0, 2, 4, 6) if (byte >> shift) & 3 in (1, 2))
+                            for byte in range(256)], dtype=np.int64)
+_PACKED_GC_4BIT = np.array([((byte >> 4) in (2, 4, 6)) + ((byte & 15) in (2, 4, 6))
+                            for byte in range(256)], dtype=np.int64)
+_REVERSED_FIELDS = np.array([((byte & 3) << 6) | ((byte >> 2 & 3) << 4) | ((byte >> 4 & 3) << 2)
+                             | (byte >> 6) for byte in range(256)], dtype=np.uint8)
+_SWAPPED_NIBBLES = np.array([(_NIBBLE_COMPLEMENT[byte & 15] << 4) | _NIBBLE_COMPLEMENT[byte >> 4]
+                             for byte in range(256)], dtype=np.uint8)
+
+
+def _runs(mask):
+    """Return (starts, ends) of the True runs in a boolean array."""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+class PackedSequence:
+    """
+    Nucleotide sequence stored at 2 or 4 bits per base.
+
+    '2bit' mode keeps A/C/G/T four to a byte and remembers N positions as
+    a list of runs; '4bit' mode keeps any IUPAC code two to a byte. Case
+    (soft-masking) is not stored. Slicing, reverse complement and GC
+    counting work on the packed bytes; text is only produced by str().
+
+    Usage:
+        chrom = PackedSequence(sequence)
+        region = chrom[10000:10100]
+        print(str(region), chrom.gc_count())
+    """
+
+    def __init__(self, sequence='', mode=None):
+        """
+        Pack a sequence.
+
+        Args:
+            sequence (str or bytes): Sequence to pack
+            mode (str): '2bit', '4bit' or None to pick 2bit when the
+                sequence only has A/C/G/T/N (default: None)
+        """
+        buffer = as_uint8(sequence)
+        codes = BASE_CODES[buffer]
+        is_n = (buffer == ord('N')) | (buffer == ord('n'))
+        if mode is None:
+            mode = '2bit' if np.all((codes < 4) | is_n) else '4bit'
+
+        if mode == '2bit':
+            bad = ~((codes < 4) | is_n)
+            if bad.any():
+                offset = int(np.argmax(bad))
+                raise ValueError(f"Base {chr(buffer[offset])!r} at {offset} needs mode='4bit'")
+            codes = np.where(is_n, 0, codes)
+            self._n_starts, self._n_ends = _runs(is_n)
+            self._data = self._pack(codes, 4)
+        elif mode == '4bit':
+            codes = _NIBBLE_CODES[buffer]
+            if (codes == 255).any():
+                offset = int(np.argmax(codes == 255))
+                raise ValueError(f"Invalid IUPAC base {chr(buffer[offset])!r} at {offset}")
+            self._n_starts = self._n_ends = np.zeros(0, dtype=np.int64)
+            self._data = self._pack(codes, 2)
+        else:
+            raise ValueError(f"Unknown mode {mode!r}; use '2bit' or '4bit'")
+        self.mode = mode
+        self._length = len(buffer)
+
+    @classmethod
+    def _from_parts(cls, data, length, mode, n_starts, n_ends):
+        packed = cls.__new__(cls)
+        packed._data = data
+        packed._length = length
+        packed.mode = mode
+        packed._n_starts = n_starts
+        packed._n_ends = n_ends
+        return packed
+
+    @property
+    def _per_byte(self):
+        return 4 if self.mode == '2bit' else 2
+
+    @staticmethod
+    def _pack(codes, per_byte):
+        """Pack small integer codes, most significant field first."""
+        bits = 8 // per_byte
+        padded = np.zeros(-(-len(codes) // per_byte) * per_byte, dtype=np.uint8)
+        padded[:len(codes)] = codes
+        fields = padded.reshape(-1, per_byte)
+        data = np.zeros(len(fields), dtype=np.uint8)
+        for column in range(per_byte):
+            data |= fields[:, column] << (bits * (per_byte - 1 - column))
+        return data
+
+    def _codes(self, start, end):
+        """Unpack the per-base codes of [start, end)."""
+        per_byte = self._per_byte
+        bits = 8 // per_byte
+        chunk = self._data[start // per_byte:-(-end // per_byte)]
+        shifts = np.arange(bits * (per_byte - 1), -1, -bits, dtype=np.uint8)
+        codes = ((chunk[:, None] >> shifts) & ((1 << bits) - 1)).ravel()
+        first = start % per_byte
+        return codes[first:first + end - start]
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def nbytes(self):
+        """Bytes used by the packed bases and N-run list."""
+        return self._data.nbytes + self._n_starts.nbytes + self._n_ends.nbytes
+
+    def __repr__(self):
+        preview = self.decode(0, min(self._length, 20))
+        more = '...' if self._length > 20 else ''
+        return f"PackedSequence('{preview}{more}', length={self._length}, mode='{self.mode}')"
+
+    def __str__(self):
+        return self.decode()
+
+    def decode(self, start=0, end=None):
+        """Return bases [start, end) as an uppercase str."""
+        start, end, _ = slice(start, end).indices(self._length)
+        if start >= end:
+            return ''
+        codes = self._codes(start, end)
+        if self.mode == '4bit':
+            letters = np.frombuffer(_NIBBLE_LETTERS.encode('ascii'), dtype=np.uint8)[codes]
+        else:
+            letters = np.frombuffer(b'ACGT', dtype=np.uint8)[codes]
+            for run_start, run_end in zip(*self._n_runs(start, end)):
+                letters[run_start:run_end] = ord('N')
+        return letters.tobytes().decode('ascii')
+
+    def _n_runs(self, start, end):
+        """N runs overlapping [start, end), clipped and shifted to start at 0."""
+        first = np.searchsorted(self._n_ends, start, side='right')
+        last = np.searchsorted(self._n_starts, end, side='left')
+        starts = np.clip(self._n_starts[first:last], start, end) - start
+        ends = np.clip(self._n_ends[first:last], start, end) - start
+        return starts, ends
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, end, step = key.indices(self._length)
+            if step != 1:
+                raise ValueError("PackedSequence slicing does not support a step")
+            end = max(start, end)
+            n_starts, n_ends = self._n_runs(start, end)
+            data = self._pack(self._codes(start, end), self._per_byte) if end > start \
+                else np.zeros(0, dtype=np.uint8)
+            return PackedSequence._from_parts(data, end - start, self.mode, n_starts, n_ends)
+        index = range(self._length)[key]
+        return self.decode(index, index + 1)
+
+    def gc_count(self):
+        """
+        Count G and C bases (plus S in 4bit mode) without decoding.
+
+        Padding and N positions are stored as code 0, which is never GC,
+        so one lookup per packed byte is enough.
+        """
+        table = _PACKED_GC_2BIT if self.mode == '2bit' else _PACKED_GC_4BIT
+        return int(table[self._data].sum())
+
+    def gc_content(self):
+        """GC percentage over the full length (same convention as gc_content)."""
+        return self.gc_count() / self._length * 100
+
+    def reverse_complement(self):
+        """
+        Return the reverse complement as a new PackedSequence.
+
+        Packed bytes are reversed and complemented through 256-entry
+        tables; the padding that ends up in front is then shifted out.
+        """
+        per_byte = self._per_byte
+        bits = 8 // per_byte
+        if self.mode == '2bit':
+            data = _REVERSED_FIELDS[self._data[::-1]] ^ np.uint8(0xFF)
+        else:
+            data = _SWAPPED_NIBBLES[self._data[::-1]]
+
+        pad = (-self._length) % per_byte
+        if pad:
+            wide = data.astype(np.uint16)
+            following = np.append(wide[1:], np.uint16(0))
+            # Zeros shifted in at the end become the new (code 0) padding
+            data = (((wide << (bits * pad)) | (following >> (8 - bits * pad))) & 0xFF).astype(np.uint8)
+
+        n_starts = self._length - self._n_ends[::-1]
+        n_ends = self._length - self._n_starts[::-1]
+        return PackedSequence._from_parts(data, self._length, self.mode, n_starts, n_ends)
@@ -0,0 +1,211 @@
+"""Core sequence operations"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from ..utils.encoding import as_uint8, reverse_segments
+from ..utils.validators import check_sequence
+from .genetic_code import BASE_CODES, INVALID_CODON, codon_tables
+
+_COMPLEMENT = bytes.maketrans(b'ACGTUMRWSYKVHDBNacgtumrwsykvhdbn',
+                              b'TGCAAKYWSRMBDHVNtgcaakywsrmbdhvn')
+
+
+def reverse_complement(sequence):
+    """
+    Return reverse complement of a DNA sequence.
+
+    Uses one bytes.translate pass with a full IUPAC table (N, R, Y, ...
+    and U are supported) and keeps the case of each base, so soft-masked
+    regions stay lowercase.
+
+    str and bytes inputs return a new object of the same type. bytearray
+    and writable memoryview inputs are reverse complemented in place and
+    returned.
+
+    Args:
+        sequence (str, bytes, bytearray or memoryview): DNA sequence
+
+    Returns:
+        Reverse complement, same type as the input
+    """
+    if isinstance(sequence, str):
+        data = sequence.encode('ascii')
+        check_sequence(data, 'iupac')
+        return data.translate(_COMPLEMENT)[::-1].decode('ascii')
+    if isinstance(sequence, bytearray):
+        check_sequence(sequence, 'iupac')
+        sequence[:] = sequence.translate(_COMPLEMENT)
+        sequence.reverse()
+        return sequence
+    if isinstance(sequence, memoryview):
+        data = sequence.tobytes()
+        check_sequence(data, 'iupac')
+        sequence[:] = data.translate(_COMPLEMENT)[::-1]
+        return sequence
+    check_sequence(sequence, 'iupac')
+    return sequence.translate(_COMPLEMENT)[::-1]
+
+
+def reverse_complement_batch(sequences, offsets=None):
+    """
+    Reverse complement many sequences at once.
+
+    With a concatenated buffer and offsets, the whole buffer is translated
+    in one pass and reversed once; reverse_segments then puts the records
+    back in their original order. Bytes outside offsets[0]:offsets[-1]
+    are dropped, so the result starts at 0 rather than at offsets[0].
+
+    Args:
+        sequences (list or buffer): List of sequences, or one concatenated
+            bytes/uint8 buffer when offsets is given
+        offsets (array): n + 1 boundaries into the buffer (default: None)
+
+    Returns:
+        list of reverse complements for list input, otherwise a uint8
+        array of just the offsets[0]:offsets[-1] range, laid out with
+        offsets - offsets[0]
+    """
+    if offsets is None:
+        return [reverse_complement(sequence) for sequence in sequences]
+
+    buffer = as_uint8(sequences)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    buffer = buffer[offsets[0]:offsets[-1]]
+    offsets = offsets - offsets[0]
+    data = buffer.tobytes()
+    check_sequence(data, 'iupac')
+    complement = np.frombuffer(data.translate(_COMPLEMENT), dtype=np.uint8)
+    return reverse_segments(complement, offsets)
+
+
+def _codon_indices(codes):
+    """
+    Codon index for every start position of a 2-bit code array.
+
+    Entry i encodes codes[i:i + 3]; triples with an invalid base map to
+    INVALID_CODON. Any reading frame f is then simply result[f::3].
+    """
+    if len(codes) < 3:
+        return np.zeros(0, dtype=np.uint8)
+    first, second, third = codes[:-2], codes[1:-1], codes[2:]
+    indices = first * 16 + second * 4 + third
+    indices[(first | second | third) > 3] = INVALID_CODON
+    return indices
+
+
+def _strand_codes(sequence):
+    """2-bit codes for the forward strand and its reverse complement."""
+    codes = BASE_CODES[as_uint8(sequence)]
+    reverse = codes[::-1].copy()
+    valid = reverse < 4
+    reverse[valid] = 3 - reverse[valid]
+    return codes, reverse
+
+
+def translate(sequence, table=1, frame=0, to_stop=False):
+    """
+    Translate DNA (or RNA) to protein.
+
+    Codons are 2-bit encoded with NumPy and looked up in a 64-entry table
+    for the chosen NCBI genetic code. Codons containing N or other
+    ambiguous bases become 'X'; stops are written as '*'.
+
+    Args:
+        sequence (str or bytes): Nucleotide sequence
+        table (int): NCBI genetic code table number (default: 1)
+        frame (int): Reading frame offset 0, 1 or 2 (default: 0)
+        to_stop (bool): Stop at the first stop codon (default: False)
+
+    Returns:
+        str: Protein sequence
+    """
+    amino_acids, _ = codon_tables(table)
+    codes = BASE_CODES[as_uint8(sequence)]
+    protein = amino_acids[_codon_indices(codes)[frame::3]].tobytes().decode('ascii')
+    if to_stop:
+        protein = protein.split('*', 1)[0]
+    return protein
+
+
+def translate_six_frames(sequence, table=1):
+    """
+    Translate all six reading frames in one call.
+
+    Codon indices are computed once per strand and each frame is a
+    strided view of them.
+
+    Args:
+        sequence (str or bytes): Nucleotide sequence
+        table (int): NCBI genetic code table number (default: 1)
+
+    Returns:
+        dict: Frame (+1, +2, +3, -1, -2, -3) mapped to protein sequence
+    """
+    amino_acids, _ = codon_tables(table)
+    frames = {}
+    for sign, codes in zip((1, -1), _strand_codes(sequence)):
+        protein = amino_acids[_codon_indices(codes)]
+        for frame in range(3):
+            frames[sign * (frame + 1)] = protein[frame::3].tobytes().decode('ascii')
+    return frames
+
+
+ORF = namedtuple('ORF', ['strand', 'frame', 'start', 'end', 'protein'])
+
+
+def find_orfs(sequence, table=1, min_length=30, alternative_starts=False):
+    """
+    Find open reading frames on both strands.
+
+    An ORF runs from the first start codon after a stop (or the sequence
+    start) to the next in-frame stop codon. Start and stop positions are
+    located with vectorized searches, not a per-codon loop.
+
+    Args:
+        sequence (str or bytes): Nucleotide sequence
+        table (int): NCBI genetic code table number (default: 1)
+        min_length (int): Minimum protein length in amino acids (default: 30)
+        alternative_starts (bool): Also accept the table's non-ATG start
+            codons such as TTG/CTG (default: False)
+
+    Returns:
+        list: ORF(strand, frame, start, end, protein) tuples, where start
+            and end are 0-based half-open forward-strand coordinates that
+            include the stop codon, and protein excludes the stop
+    """
+    amino_acids, is_start = codon_tables(table)
+    if not alternative_starts:
+        is_start = is_start & (amino_acids == ord('M'))
+    sequence_length = len(sequence)
+    orfs = []
+
+    for strand, codes in zip('+-', _strand_codes(sequence)):
+        indices = _codon_indices(codes)
+        for frame in range(3):
+            frame_indices = indices[frame::3]
+            protein = amino_acids[frame_indices]
+            stops = np.flatnonzero(protein == ord('*'))
+            starts = np.flatnonzero(is_start[frame_indices])
+            if len(stops) == 0 or len(starts) == 0:
+                continue
+
+            # First start codon in each stop-to-stop interval
+            next_stop = np.searchsorted(stops, starts)
+            has_stop = next_stop < len(stops)
+            starts, next_stop = starts[has_stop], next_stop[has_stop]
+            _, first = np.unique(next_stop, return_index=True)
+            starts, ends = starts[first], stops[next_stop[first]]
+
+            keep = ends - starts >= min_length
+            for codon_start, codon_end in zip(starts[keep].tolist(), ends[keep].tolist()):
+                peptide = protein[codon_start:codon_end].tobytes().decode('ascii')
+                start = frame + 3 * codon_start
+                end = frame + 3 * (codon_end + 1)
+                if strand == '-':
+                    start, end = sequence_length - end, sequence_length - start
+                orfs.append(ORF(strand, frame + 1, start, end, peptide))
+
+    orfs.sort(key=lambda orf: (orf.start, orf.strand))
+    return orfs
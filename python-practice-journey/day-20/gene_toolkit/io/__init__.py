@@ -0,0 +1,11 @@
+"""Readers and writers for sequence files"""
+
+from .._lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    '.readers': ['read_fasta', 'iter_fasta', 'iter_fastq'],
+    '.indexed': ['IndexedFasta', 'build_fai', 'read_fai'],
+    '.writers': ['write_fasta', 'write_fastq', 'write_bedgraph'],
+    '.compression': ['open_sequence_file', 'open_output_file', 'BgzfReader', 'BgzfWriter',
+                     'is_gzip', 'is_bgzf'],
+})
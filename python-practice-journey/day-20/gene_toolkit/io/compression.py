@@ -0,0 +1,292 @@
+"""Transparent gzip / BGZF input and output with threaded block (de)compression"""
+
+import io
+import os
+import struct
+import zlib
+from collections import deque
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_BGZF_HEADER = struct.Struct('<4BI2BH2BHH')   # gzip header + 'BC' extra subfield
+_BGZF_BLOCK_DATA = 0xff00                       # uncompressed bytes per block, as in htslib
+_BGZF_MAX_BLOCK = 1 << 16
+_BGZF_EOF = bytes.fromhex('1f8b08040000000000ff0600424302001b0003000000000000000000')
+
+
+def is_gzip(filename):
+    """Check the gzip magic bytes at the start of a file."""
+    with open(filename, 'rb') as f:
+        return f.read(2) == _GZIP_MAGIC
+
+
+def is_bgzf(filename):
+    """Check whether a file starts with a BGZF block (gzip with a 'BC' extra field)."""
+    with open(filename, 'rb') as f:
+        header = f.read(_BGZF_HEADER.size)
+    if len(header) < _BGZF_HEADER.size:
+        return False
+    fields = _BGZF_HEADER.unpack(header)
+    id1, id2, method, flags, xlen, si1, si2, slen = (fields[0], fields[1], fields[2], fields[3],
+                                                     fields[7], fields[8], fields[9], fields[10])
+    return ((id1, id2, method) == (0x1f, 0x8b, 8) and bool(flags & 4) and xlen >= 6
+            and (si1, si2, slen) == (66, 67, 2))
+
+
+def _inflate_block(block):
+    """Decompress one BGZF block and check its CRC32 (runs in a worker thread)."""
+    extra_length = struct.unpack_from('<H', block, 10)[0]
+    data = zlib.decompress(block[12 + extra_length:-8], -15)
+    crc, size = struct.unpack('<II', block[-8:])
+    if size != len(data) or zlib.crc32(data) != crc:
+        raise OSError("BGZF block failed its CRC/size check")
+    return data
+
+
+class BgzfReader(io.RawIOBase):
+    """
+    Read-only raw stream over a BGZF file with parallel block inflation.
+
+    BGZF blocks are independent deflate streams, so they are read in
+    order on the calling thread, decompressed by a thread pool (zlib
+    releases the GIL) and consumed in order from a read-ahead queue.
+    Wrap in io.BufferedReader (open_sequence_file does this) for
+    readline() and line iteration.
+    """
+
+    def __init__(self, filename, threads=None, read_ahead=None):
+        """
+        Args:
+            filename (str): Path to BGZF file
+            threads (int): Decompression threads (default: os.cpu_count())
+            read_ahead (int): Blocks kept in flight (default: 4 * threads)
+        """
+        # Imported here: concurrent.futures pulls in logging and costs
+        # ~20 ms at startup, which plain-text reads should not pay
+        from concurrent.futures import ThreadPoolExecutor
+
+        super().__init__()
+        self._file = open(filename, 'rb')
+        self._threads = threads or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=self._threads)
+        self._read_ahead = read_ahead or 4 * self._threads
+        self._pending = deque()
+        self._current = memoryview(b'')
+        self._eof = False
+
+    def readable(self):
+        return True
+
+    def _next_block(self):
+        """Read the next compressed block from disk, or None at end of file."""
+        header = self._file.read(_BGZF_HEADER.size)
+        if not header:
+            return None
+        if len(header) < _BGZF_HEADER.size:
+            raise OSError("Truncated BGZF block header")
+        fields = _BGZF_HEADER.unpack(header)
+        if fields[:2] != (0x1f, 0x8b) or (fields[8], fields[9]) != (66, 67):
+            raise OSError("Not a BGZF block (is the file plain gzip?)")
+        remaining = fields[11] + 1 - _BGZF_HEADER.size
+        body = self._file.read(remaining)
+        if len(body) < remaining:
+            raise OSError("Truncated BGZF block")
+        return header + body
+
+    def _fill_queue(self):
+        while not self._eof and len(self._pending) < self._read_ahead:
+            block = self._next_block()
+            if block is None:
+                self._eof = True
+            else:
+                self._pending.append(self._executor.submit(_inflate_block, block))
+
+    def readinto(self, buffer):
+        while not self._current:
+            self._fill_queue()
+            if not self._pending:
+                return 0
+            self._current = memoryview(self._pending.popleft().result())
+        count = min(len(buffer), len(self._current))
+        buffer[:count] = self._current[:count]
+        self._current = self._current[count:]
+        return count
+
+    def close(self):
+        if not self.closed:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=False)
+            self._file.close()
+        super().close()
+
+
+def open_sequence_file(filename, threads=None):
+    """
+    Open a plain, gzip or BGZF file for binary reading.
+
+    BGZF input gets threaded block decompression; other gzip files use
+    the standard gzip module; anything else is opened as-is.
+
+    Args:
+        filename (str): Path to file
+        threads (int): Decompression threads for BGZF (default: os.cpu_count())
+
+    Returns:
+        Binary file object supporting read(), readline() and iteration
+    """
+    if is_bgzf(filename):
+        return io.BufferedReader(BgzfReader(filename, threads), buffer_size=1 << 20)
+    if is_gzip(filename):
+        import gzip
+        return gzip.open(filename, 'rb')
+    return open(filename, 'rb')
+
+
+def _deflate_block(data, level):
+    """Compress up to 64 KB into one BGZF block (runs in a worker thread)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    body = compressor.compress(data) + compressor.flush()
+    if len(body) + _BGZF_HEADER.size + 8 > _BGZF_MAX_BLOCK:
+        # Incompressible data: stored deflate blocks always fit
+        compressor = zlib.compressobj(0, zlib.DEFLATED, -15)
+        body = compressor.compress(data) + compressor.flush()
+    block_size = _BGZF_HEADER.size + len(body) + 8
+    header = _BGZF_HEADER.pack(0x1f, 0x8b, 8, 4, 0, 0, 0xff, 6, 66, 67, 2, block_size - 1)
+    return header + body + struct.pack('<II', zlib.crc32(data), len(data))
+
+
+class BgzfWriter(io.RawIOBase):
+    """
+    Write-only raw stream producing a BGZF file with parallel block deflation.
+
+    Data is cut into 65280-byte pieces, compressed by a thread pool and
+    written in order, followed by the standard empty EOF block on close.
+    The output can be read by samtools/htslib and by BgzfReader.
+    """
+
+    def __init__(self, filename, threads=None, level=6):
+        """
+        Args:
+            filename (str): Path to write
+            threads (int): Compression threads (default: os.cpu_count())
+            level (int): zlib compression level (default: 6)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        super().__init__()
+        self._file = open(filename, 'wb')
+        self._threads = threads or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=self._threads)
+        self._level = level
+        self._pending = deque()
+        self._buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def _submit(self, data):
+        self._pending.append(self._executor.submit(_deflate_block, data, self._level))
+        while len(self._pending) > 4 * self._threads:
+            self._file.write(self._pending.popleft().result())
+
+    def write(self, data):
+        self._buffer += data
+        if len(self._buffer) >= _BGZF_BLOCK_DATA:
+            view = memoryview(self._buffer)
+            full = len(self._buffer) - len(self._buffer) % _BGZF_BLOCK_DATA
+            for start in range(0, full, _BGZF_BLOCK_DATA):
+                self._submit(bytes(view[start:start + _BGZF_BLOCK_DATA]))
+            view.release()
+            del self._buffer[:full]
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            try:
+                if self._buffer:
+                    self._submit(bytes(self._buffer))
+                while self._pending:
+                    self._file.write(self._pending.popleft().result())
+                self._file.write(_BGZF_EOF)
+            finally:
+                self._executor.shutdown()
+                self._file.close()
+        super().close()
+
+
+class _BackgroundWriter(io.RawIOBase):
+    """
+    Hand writes to a thread that feeds another binary stream.
+
+    Used for gzip output: compression (zlib releases the GIL) overlaps
+    with building the next buffer on the calling thread. Errors raised by
+    the worker are re-raised on the next write or on close.
+    """
+
+    def __init__(self, stream, max_pending=4):
+        import queue
+        import threading
+
+        super().__init__()
+        self._stream = stream
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def writable(self):
+        return True
+
+    def _run(self):
+        while True:
+            data = self._queue.get()
+            if data is None:
+                return
+            if self._error is None:
+                try:
+                    self._stream.write(data)
+                except Exception as error:
+                    self._error = error
+
+    def write(self, data):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(bytes(data))
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._queue.put(None)
+            self._thread.join()
+            self._stream.close()
+            if self._error is not None:
+                raise self._error
+        super().close()
+
+
+def open_output_file(filename, compression='infer', threads=None, level=6):
+    """
+    Open a file for binary writing, optionally compressed off the main thread.
+
+    Args:
+        filename (str): Path to write
+        compression (str): 'gzip', 'bgzf', None for plain output, or
+            'infer' to pick from the extension: .bgz -> BGZF, .gz -> gzip
+            (default: 'infer')
+        threads (int): Compression threads for BGZF (default: os.cpu_count())
+        level (int): zlib compression level (default: 6)
+
+    Returns:
+        Binary file object supporting write() and close()
+    """
+    if compression == 'infer':
+        compression = ('bgzf' if filename.endswith('.bgz') else
+                       'gzip' if filename.endswith('.gz') else None)
+    if compression == 'bgzf':
+        return BgzfWriter(filename, threads, level)
+    if compression == 'gzip':
+        import gzip
+        return _BackgroundWriter(gzip.open(filename, 'wb', compresslevel=level))
+    if compression is None:
+        return open(filename, 'wb')
+    raise ValueError(f"Unknown compression: {compression}")
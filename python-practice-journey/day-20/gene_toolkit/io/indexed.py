@@ -0,0 +1,203 @@
+"""Random-access FASTA reading through a samtools-compatible .fai index"""
+
+import mmap
+import os
+
+from .compression import is_gzip
+
+
+def _check_uncompressed(filename):
+    """Offsets in a .fai index only make sense for an uncompressed file."""
+    if is_gzip(filename):
+        raise ValueError(f"{filename} is gzip/BGZF compressed; indexed access needs an "
+                         f"uncompressed FASTA (decompress it first)")
+
+
+def build_fai(filename, fai_filename=None):
+    """
+    Scan a FASTA file once and write a samtools-compatible .fai index.
+
+    Each index line holds: name, length, offset, line bases, line bytes.
+
+    Args:
+        filename (str): Path to FASTA file
+        fai_filename (str): Where to write the index (default: filename + '.fai')
+
+    Returns:
+        dict: Sequence name mapped to (length, offset, line_bases, line_bytes)
+    """
+    _check_uncompressed(filename)
+    if fai_filename is None:
+        fai_filename = filename + '.fai'
+
+    index = {}
+    name = None
+    length = offset = line_bases = line_bytes = 0
+    short_line_seen = False
+    position = 0
+
+    with open(filename, 'rb') as f:
+        for line in f:
+            if line.startswith(b'>'):
+                if name is not None:
+                    index[name] = (length, offset, line_bases, line_bytes)
+                name = line[1:].split(None, 1)[0].decode('ascii')
+                if name in index:
+                    raise ValueError(f"Duplicate sequence name in FASTA: {name}")
+                length = line_bases = line_bytes = 0
+                offset = position + len(line)
+                short_line_seen = False
+            elif name is not None:
+                bases = len(line.rstrip(b'\r\n'))
+                if bases:
+                    if line_bases == 0:
+                        line_bases, line_bytes = bases, len(line)
+                    elif short_line_seen or bases > line_bases:
+                        raise ValueError(f"Inconsistent line lengths in sequence: {name}")
+                    elif bases < line_bases:
+                        short_line_seen = True
+                    length += bases
+            position += len(line)
+        if name is not None:
+            index[name] = (length, offset, line_bases, line_bytes)
+
+    with open(fai_filename, 'w') as out:
+        for seq_name, (length, offset, line_bases, line_bytes) in index.items():
+            out.write(f"{seq_name}\t{length}\t{offset}\t{line_bases}\t{line_bytes}\n")
+    return index
+
+
+def read_fai(fai_filename):
+    """
+    Read a .fai index file.
+
+    Args:
+        fai_filename (str): Path to .fai file
+
+    Returns:
+        dict: Sequence name mapped to (length, offset, line_bases, line_bytes)
+    """
+    index = {}
+    with open(fai_filename, 'r') as f:
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) < 5:
+                continue
+            index[fields[0]] = tuple(int(value) for value in fields[1:5])
+    return index
+
+
+class IndexedFasta:
+    """
+    Memory-mapped FASTA file with region lookups through a .fai index.
+
+    Only the pages covering the requested region are touched, so lookups
+    never read unrelated chromosomes and resident memory stays small.
+
+    Usage:
+        with IndexedFasta('genome.fa') as fasta:
+            region = fasta.fetch('chr1', 10000, 10100)
+    """
+
+    def __init__(self, filename, fai_filename=None, build_index=True):
+        """
+        Open a FASTA file, reading its .fai index or building one if missing.
+
+        Args:
+            filename (str): Path to FASTA file
+            fai_filename (str): Path to index (default: filename + '.fai')
+            build_index (bool): Build the index if it does not exist (default: True)
+        """
+        _check_uncompressed(filename)
+        self.filename = filename
+        self.fai_filename = fai_filename or filename + '.fai'
+        if os.path.exists(self.fai_filename):
+            self.index = read_fai(self.fai_filename)
+        elif build_index:
+            self.index = build_fai(filename, self.fai_filename)
+        else:
+            raise FileNotFoundError(f"No FASTA index found: {self.fai_filename}")
+
+        self._file = open(filename, 'rb')
+        if os.path.getsize(filename) > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._mmap = b''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def keys(self):
+        """Return the sequence names in file order."""
+        return self.index.keys()
+
+    def length(self, name):
+        """Return the length of one sequence."""
+        return self._entry(name)[0]
+
+    def close(self):
+        """Release the memory map and file handle."""
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+        self._file.close()
+
+    def _entry(self, name):
+        try:
+            return self.index[name]
+        except KeyError:
+            raise KeyError(f"Sequence not in index: {name}") from None
+
+    def iter_chunks(self, name, chunk_size=1000000, as_bytes=True):
+        """
+        Yield one sequence as consecutive chunks of chunk_size bases.
+
+        Args:
+            name (str): Sequence name
+            chunk_size (int): Bases per chunk (default: 1000000)
+            as_bytes (bool): Yield bytes instead of str (default: True)
+        """
+        length = self.length(name)
+        for start in range(0, length, chunk_size):
+            yield self.fetch(name, start, start + chunk_size, as_bytes=as_bytes)
+
+    def fetch(self, name, start=0, end=None, as_bytes=False):
+        """
+        Return a region of one sequence.
+
+        Coordinates are 0-based and half-open like Python slicing, and are
+        clipped to the sequence length.
+
+        Args:
+            name (str): Sequence name
+            start (int): Region start (default: 0)
+            end (int): Region end (default: end of sequence)
+            as_bytes (bool): Return bytes instead of str (default: False)
+
+        Returns:
+            str: Sequence of the region (bytes if as_bytes is True)
+        """
+        length, offset, line_bases, line_bytes = self._entry(name)
+        if end is None or end > length:
+            end = length
+        start = max(start, 0)
+        if start >= end:
+            return b'' if as_bytes else ''
+
+        first = offset + (start // line_bases) * line_bytes + start % line_bases
+        last = offset + (end // line_bases) * line_bytes + end % line_bases
+        region = self._mmap[first:last]
+        if line_bytes != line_bases:
+            region = region.translate(None, b'\r\n')
+        return region if as_bytes else region.decode('ascii')
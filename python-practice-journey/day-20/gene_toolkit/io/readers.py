@@ -0,0 +1,185 @@
+"""Sequence file readers"""
+
+from .compression import open_sequence_file
+
+
+def _split_header(header):
+    """Split a FASTA header (without '>') into (id, description)."""
+    parts = header.split(None, 1)
+    record_id = parts[0] if parts else header
+    return record_id, header
+
+
+def detect_format(filename):
+    """Return 'fasta' or 'fastq' from the first non-blank byte of a file."""
+    with open_sequence_file(filename) as f:
+        first = f.read(1024).lstrip()[:1]
+    if first == b'>':
+        return 'fasta'
+    if first == b'@':
+        return 'fastq'
+    raise ValueError(f"Cannot tell whether {filename} is FASTA or FASTQ")
+
+
+def iter_fasta(filename, as_bytes=False, start=0, end=None):
+    """
+    Stream records from a FASTA file one at a time.
+
+    Sequence lines are collected in a bytearray and converted once per
+    record, so peak memory is bounded by the largest single record rather
+    than by the whole file. gzip and BGZF input is decompressed on the fly.
+
+    Args:
+        filename (str): Path to FASTA file
+        as_bytes (bool): Yield bytes instead of str (default: False)
+        start (int): Byte offset of the first record to read, uncompressed
+            files only (default: 0)
+        end (int): Stop at the first record starting at or after this byte
+            offset (default: None, read to the end)
+
+    Yields:
+        tuple: (id, description, sequence) where id is the first word of the
+            header and description is the full header line without '>'
+    """
+    with open_sequence_file(filename) as f:
+        if start:
+            f.seek(start)
+        position = start
+        header = None
+        sequence = bytearray()
+        for line in f:
+            if line.startswith(b'>'):
+                if header is not None:
+                    yield _make_record(header, sequence, as_bytes)
+                if end is not None and position >= end:
+                    return
+                header = line[1:].strip()
+                sequence = bytearray()
+            elif header is not None:
+                sequence += line.strip()
+            position += len(line)
+        if header is not None:
+            yield _make_record(header, sequence, as_bytes)
+
+
+def _make_record(header, sequence, as_bytes):
+    """Build one (id, description, sequence) tuple in the requested mode."""
+    if as_bytes:
+        record_id, description = _split_header(header)
+        return record_id, description, bytes(sequence)
+    record_id, description = _split_header(header.decode('ascii'))
+    return record_id, description, sequence.decode('ascii')
+
+
+def read_fasta(filename):
+    """
+    Read a FASTA file into a dictionary.
+
+    Args:
+        filename (str): Path to FASTA file
+
+    Returns:
+        dict: Full header line (without '>') mapped to its sequence
+    """
+    return {description: sequence
+            for _, description, sequence in iter_fasta(filename)}
+
+
+def iter_fastq(filename, as_bytes=False, start=0, end=None):
+    """
+    Stream records from a FASTQ file one at a time.
+
+    Records are expected in the usual four-line layout (header, sequence,
+    '+' line, qualities). gzip and BGZF input is decompressed on the fly.
+
+    Args:
+        filename (str): Path to FASTQ file
+        as_bytes (bool): Yield bytes instead of str (default: False)
+        start (int): Byte offset of the first record to read, uncompressed
+            files only (default: 0)
+        end (int): Stop at the first record starting at or after this byte
+            offset (default: None, read to the end)
+
+    Yields:
+        tuple: (id, description, sequence, quality)
+    """
+    with open_sequence_file(filename) as f:
+        if start:
+            f.seek(start)
+        while True:
+            if end is not None and f.tell() >= end:
+                return
+            header = f.readline()
+            if not header:
+                return
+            if not header.strip():
+                continue
+            sequence = f.readline().rstrip(b'\r\n')
+            plus = f.readline()
+            quality = f.readline().rstrip(b'\r\n')
+            if not header.startswith(b'@') or not plus.startswith(b'+'):
+                raise ValueError(f"Malformed FASTQ record near: {header[:50]!r}")
+            header = header[1:].strip()
+            if not as_bytes:
+                header = header.decode('ascii')
+                sequence = sequence.decode('ascii')
+                quality = quality.decode('ascii')
+            record_id, description = _split_header(header)
+            yield record_id, description, sequence, quality
+
+
+def iter_fastq_blocks(filename, chunk_size=1 << 24, start=0, end=None, partial=False):
+    """
+    Stream a FASTQ file as large bytes blocks of whole four-line records.
+
+    Each read is extended with the previous block's partial record, so
+    every block ends on a record boundary and can be parsed with array
+    operations. Trailing blank lines and a missing final newline are
+    accepted.
+
+    Args:
+        filename (str): Path to FASTQ file (plain, gzip or BGZF)
+        chunk_size (int): Bytes read per block (default: 16 MB)
+        start (int): Byte offset of the first record, uncompressed files
+            only (default: 0)
+        end (int): Byte offset to stop reading at (default: None, read to
+            the end)
+        partial (bool): Yield an incomplete final record as a last block
+            whose newline count is not a multiple of 4, instead of raising
+            ValueError (default: False)
+
+    Yields:
+        bytes: Blocks of records, each line ending in a newline
+    """
+    carry = b''
+    remaining = None if end is None else end - start
+    with open_sequence_file(filename) as f:
+        if start:
+            f.seek(start)
+        while True:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            data = f.read(size) if size else b''
+            if remaining is not None:
+                remaining -= len(data)
+            buffer = carry + data
+            if not data:
+                buffer = buffer.rstrip(b'\r\n')
+                if buffer:
+                    buffer += b'\n'
+            newlines = buffer.count(b'\n')
+            whole = newlines - newlines % 4
+            cut = 0
+            if whole:
+                # Step back over the newlines of the trailing partial record
+                cut = len(buffer)
+                for _ in range(newlines - whole + 1):
+                    cut = buffer.rfind(b'\n', 0, cut)
+                cut += 1
+                yield buffer[:cut]
+            carry = buffer[cut:]
+            if not data:
+                if carry:
+                    if not partial:
+                        raise ValueError(f"{filename} ends inside a FASTQ record")
+                    yield carry
+                return
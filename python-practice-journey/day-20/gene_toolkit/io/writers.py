@@ -0,0 +1,121 @@
+"""Sequence and track file writers"""
+
+import io
+
+from .compression import open_output_file
+
+
+def write_bedgraph(output, chrom, starts, values, window, precision=4):
+    """
+    Write window values as bedGraph lines (chrom, start, end, value).
+
+    Windows whose value is NaN are skipped. Pass an open file handle to
+    append several chromosomes or streamed batches to one file.
+
+    Args:
+        output (str or file): Path to write, or an open text file handle
+        chrom (str): Chromosome name for every line
+        starts (array): 0-based window starts
+        values (array): One value per window
+        window (int): Window size; end = start + window
+        precision (int): Decimal places for values (default: 4)
+    """
+    lines = [f"{chrom}\t{start}\t{start + window}\t{value:.{precision}f}\n"
+             for start, value in zip(starts.tolist(), values.tolist())
+             if value == value]
+    if isinstance(output, str):
+        with open(output, 'w') as f:
+            f.writelines(lines)
+    else:
+        output.writelines(lines)
+
+
+def _as_bytes(value):
+    return value.encode('ascii') if isinstance(value, str) else bytes(value)
+
+
+def _write_buffered(output, chunks, compression, buffer_size, threads):
+    """
+    Join byte chunks into large buffers and write each with one call.
+
+    Paths are opened through open_output_file (optionally compressed);
+    open handles are written as-is, decoding for text-mode handles.
+    """
+    if isinstance(output, str):
+        with open_output_file(output, compression, threads) as f:
+            _write_buffered(f, chunks, None, buffer_size, threads)
+        return
+
+    if isinstance(output, io.TextIOBase):
+        def write(data):
+            output.write(data.decode('ascii'))
+    else:
+        write = output.write
+    parts, size = [], 0
+    for chunk in chunks:
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            write(b''.join(parts))
+            parts, size = [], 0
+    if parts:
+        write(b''.join(parts))
+
+
+def _fasta_chunks(records, width):
+    if isinstance(records, dict):
+        records = records.items()
+    for record in records:
+        # (header, sequence) pairs, or (id, description, sequence) from iter_fasta
+        header, sequence = _as_bytes(record[-2]), _as_bytes(record[-1])
+        if width and len(sequence) > width:
+            sequence = b'\n'.join([sequence[i:i + width] for i in range(0, len(sequence), width)])
+        yield b'>' + header + b'\n'
+        if sequence:
+            yield sequence + b'\n'
+
+
+def write_fasta(output, records, width=60, compression='infer', buffer_size=1 << 22,
+                threads=None):
+    """
+    Write FASTA records with line wrapping through large buffered writes.
+
+    Sequences are wrapped by slicing, and output is collected into
+    buffer_size byte blocks that each go out in a single write call. gzip
+    output is compressed on a background thread and BGZF output on a
+    thread pool, so the caller keeps producing records meanwhile.
+
+    Args:
+        output (str or file): Path to write, or an open file handle
+        records (dict or iterable): read_fasta-style dict, (header,
+            sequence) pairs or iter_fasta (id, description, sequence)
+            tuples; str or bytes
+        width (int): Bases per line, 0 or None for one line (default: 60)
+        compression (str): For paths: 'gzip', 'bgzf', None, or 'infer'
+            from a .gz/.bgz extension (default: 'infer')
+        buffer_size (int): Bytes collected per write (default: 4 MB)
+        threads (int): BGZF compression threads (default: os.cpu_count())
+    """
+    _write_buffered(output, _fasta_chunks(records, width), compression, buffer_size, threads)
+
+
+def _fastq_chunks(records):
+    for record in records:
+        # (header, sequence, quality), or (id, description, sequence, quality) from iter_fastq
+        header, sequence, quality = (_as_bytes(value) for value in record[-3:])
+        if len(sequence) != len(quality):
+            raise ValueError(f"Sequence and quality lengths differ for {header.decode('ascii')}")
+        yield b'@' + header + b'\n' + sequence + b'\n+\n' + quality + b'\n'
+
+
+def write_fastq(output, records, compression='infer', buffer_size=1 << 22, threads=None):
+    """
+    Write four-line FASTQ records through large buffered writes.
+
+    Args:
+        output (str or file): Path to write, or an open file handle
+        records (iterable): (header, sequence, quality) tuples or
+            iter_fastq (id, description, sequence, quality) tuples
+        compression, buffer_size, threads: As in write_fasta
+    """
+    _write_buffered(output, _fastq_chunks(records), compression, buffer_size, threads)
@@ -0,0 +1,12 @@
+"""Validation and helper utilities"""
+
+from .._lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    '.validators': ['validate_dna', 'find_invalid', 'check_sequence', 'validate_batch'],
+    '.encoding': ['as_uint8', 'pack_sequences'],
+    '.parallel': ['map_records', 'shard_ranges'],
+    '.fastq_validator': ['validate_fastq', 'validate_fastq_pair', 'validate_fastq_files',
+                         'pair_files'],
+    '.cache': ['ResultCache', 'cached', 'default_cache', 'sequence_key'],
+})
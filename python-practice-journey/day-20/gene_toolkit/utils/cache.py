@@ -0,0 +1,234 @@
+"""Content-addressed memoization of per-sequence results"""
+
+import functools
+import hashlib
+import inspect
+import pickle
+import threading
+from collections import OrderedDict
+
+from .. import __version__
+
+_MISSING = object()
+
+
+def _digest_update(digest, value):
+    """Feed one argument into a hash: raw bytes for sequences, repr otherwise."""
+    if isinstance(value, str):
+        digest.update(b's' + value.encode('utf-8'))
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        digest.update(b'b' + bytes(value))
+    elif hasattr(value, 'tobytes') and hasattr(value, 'dtype'):
+        digest.update(f'a{value.dtype}{value.shape}'.encode('ascii') + value.tobytes())
+    else:
+        digest.update(b'r' + repr(value).encode('utf-8'))
+    digest.update(b'\0')
+
+
+def sequence_key(name, sequence, params=()):
+    """
+    Cache key for a function applied to one sequence.
+
+    The sequence bytes, the function name and the (name, value) parameter
+    pairs are hashed with BLAKE2b, which runs at roughly memory speed, so
+    keying even long sequences is cheap next to analysing them.
+
+    Args:
+        name (str): Function identifier
+        sequence (str, bytes or array): The sequence
+        params (iterable): (name, value) pairs of the other arguments
+
+    Returns:
+        str: 32-character hex key
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _digest_update(digest, name)
+    for param, value in params:
+        _digest_update(digest, param)
+        _digest_update(digest, value)
+    _digest_update(digest, sequence)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    LRU result cache with optional persistent sqlite store.
+
+    Values are pickled, so callers always get their own copy, and the
+    pickle size drives eviction: least recently used entries are dropped
+    once the in-memory total passes max_bytes. With a path, every result
+    is also written to sqlite and looked up there on a memory miss, so
+    results survive restarts and are shared between processes.
+
+    Usage:
+        cache = ResultCache(max_bytes=64 << 20, path='results.sqlite')
+        fast_tm = cached(calculate_tm, cache=cache)
+        cache.stats()
+    """
+
+    def __init__(self, max_bytes=64 << 20, path=None):
+        """
+        Args:
+            max_bytes (int): In-memory size limit in pickled bytes (default: 64 MB)
+            path (str): sqlite file for the persistent store (default: None,
+                memory only)
+        """
+        self.max_bytes = max_bytes
+        self.path = path
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(('hits', 'disk_hits', 'misses', 'evictions'), 0)
+        self._db = None
+        if path is not None:
+            import sqlite3
+            self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS results '
+                             '(key TEXT PRIMARY KEY, value BLOB NOT NULL)')
+
+    def _remember(self, key, blob):
+        """Insert into the LRU and evict from the cold end (lock held)."""
+        if key in self._entries:
+            self._bytes -= len(self._entries.pop(key))
+        if len(blob) > self.max_bytes:
+            return
+        self._entries[key] = blob
+        self._bytes += len(blob)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._stats['evictions'] += 1
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default."""
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return pickle.loads(blob)
+            if self._db is not None:
+                row = self._db.execute('SELECT value FROM results WHERE key = ?',
+                                       (key,)).fetchone()
+                if row is not None:
+                    self._remember(key, row[0])
+                    self._stats['disk_hits'] += 1
+                    return pickle.loads(row[0])
+            self._stats['misses'] += 1
+            return default
+
+    def set(self, key, value):
+        """Store a value in memory and, if configured, on disk."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, blob)
+            if self._db is not None:
+                self._db.execute('INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)',
+                                 (key, blob))
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._entries:
+                return True
+            return self._db is not None and self._db.execute(
+                'SELECT 1 FROM results WHERE key = ?', (key,)).fetchone() is not None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Hit/miss counters and current size.
+
+        Returns:
+            dict: hits, disk_hits, misses, evictions, entries, bytes and
+                hit_rate (memory and disk hits over all lookups)
+        """
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries), bytes=self._bytes)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self, disk=False):
+        """Empty the in-memory LRU (and the sqlite store if disk is True)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if disk and self._db is not None:
+                self._db.execute('DELETE FROM results')
+
+    def close(self):
+        """Close the sqlite store; the in-memory LRU stays usable."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+_default_cache = None
+
+
+def default_cache():
+    """The process-wide in-memory ResultCache used when none is given."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+
+def cached(function=None, cache=None, sequence_arg=0):
+    """
+    Memoize a per-sequence function on the content of its sequence argument.
+
+    Arguments are bound to the function's signature with defaults filled
+    in, so calculate_tm(seq) and calculate_tm(seq, dna_conc=250.0) share
+    an entry. The key also carries the function's module, name and the
+    package version, so persistent results are not reused across
+    upgrades. The wrapper keeps the original signature and docstring.
+
+    Usage:
+        @cached
+        def my_analysis(sequence, k=3): ...
+
+        fast_gc = cached(gc_content, cache=ResultCache(path='gc.sqlite'))
+
+    Args:
+        function (callable): Function to wrap (omit when passing options)
+        cache (ResultCache): Cache to use (default: default_cache())
+        sequence_arg (int or str): Position or name of the sequence
+            argument (default: 0)
+
+    Returns:
+        callable: Wrapped function, or a decorator when function is None
+    """
+    if function is None:
+        return functools.partial(cached, cache=cache, sequence_arg=sequence_arg)
+
+    signature = inspect.signature(function)
+    if isinstance(sequence_arg, int):
+        sequence_arg = list(signature.parameters)[sequence_arg]
+    name = f'{function.__module__}.{function.__qualname__}@{__version__}'
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        store = cache if cache is not None else default_cache()
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = [(param, value) for param, value in bound.arguments.items()
+                  if param != sequence_arg]
+        key = sequence_key(name, bound.arguments[sequence_arg], params)
+        result = store.get(key, _MISSING)
+        if result is _MISSING:
+            result = function(*args, **kwargs)
+            store.set(key, result)
+        return result
+
+    return wrapper
@@ -0,0 +1,158 @@
+"""Helpers for holding many sequences in one NumPy byte buffer"""
+
+import numpy as np
+
+# translate_buffer table: 1 for G/C (and S = G or C) in either case, 0 otherwise
+GC_TABLE = bytes(1 if chr(i) in 'GCSgcs' else 0 for i in range(256))
+
+
+def as_uint8(sequence):
+    """
+    View a str, bytes, bytearray, memoryview or array as a uint8 array.
+
+    bytes-like inputs are viewed without copying; str is ASCII-encoded once.
+    """
+    if isinstance(sequence, np.ndarray):
+        return sequence.view(np.uint8) if sequence.dtype != np.uint8 else sequence
+    if isinstance(sequence, str):
+        sequence = sequence.encode('ascii')
+    return np.frombuffer(sequence, dtype=np.uint8)
+
+
+def pack_sequences(sequences):
+    """
+    Concatenate many sequences into one uint8 buffer with offsets.
+
+    Args:
+        sequences (list): Sequences as str or bytes (not mixed)
+
+    Returns:
+        tuple: (buffer, offsets) where buffer is a uint8 array and offsets is
+            an int64 array of length n + 1; sequence i is
+            buffer[offsets[i]:offsets[i + 1]]
+    """
+    sequences = list(sequences)
+    lengths = np.fromiter(map(len, sequences), dtype=np.int64, count=len(sequences))
+    offsets = np.zeros(len(sequences) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    if sequences and isinstance(sequences[0], str):
+        joined = ''.join(sequences).encode('ascii')
+    else:
+        joined = b''.join(sequences)
+    return np.frombuffer(joined, dtype=np.uint8), offsets
+
+
+def as_buffer(sequences, offsets=None):
+    """
+    Normalise batch input to a (buffer, offsets) pair.
+
+    Accepts either a list of sequences (offsets=None) or an already
+    concatenated buffer together with its n + 1 offsets.
+    """
+    if offsets is None:
+        return pack_sequences(sequences)
+    return as_uint8(sequences), np.asarray(offsets, dtype=np.int64)
+
+
+def translate_buffer(buffer, table):
+    """
+    Map every byte of a uint8 buffer through a 256-entry table.
+
+    bytes.translate runs at close to memcpy speed, noticeably faster than
+    NumPy fancy indexing with the same table.
+
+    Args:
+        buffer (numpy.ndarray): uint8 array
+        table (bytes or numpy.ndarray): 256-entry lookup table
+
+    Returns:
+        numpy.ndarray: uint8 array of mapped values
+    """
+    if isinstance(table, np.ndarray):
+        table = table.astype(np.uint8).tobytes()
+    return np.frombuffer(buffer.tobytes().translate(table), dtype=np.uint8)
+
+
+def reverse_segments(values, offsets):
+    """
+    Reverse every [offsets[i], offsets[i + 1]) segment of an array.
+
+    The whole array is reversed once, which reverses each segment but also
+    the segment order: segment i then sits at [total - offsets[i + 1],
+    total - offsets[i]). When all segments have the same length the order
+    is flipped back with one reshape; otherwise the segments are sliced
+    back into place, one bytes slice per segment. Offsets stay valid for
+    the result.
+
+    Args:
+        values (numpy.ndarray): Concatenated segments; offsets[0] must be 0
+        offsets (numpy.ndarray): n + 1 segment boundaries
+
+    Returns:
+        numpy.ndarray: New array with each segment reversed
+    """
+    total = int(offsets[-1])
+    reversed_values = values[:total][::-1]
+    lengths = np.diff(offsets)
+    if not len(lengths):
+        return reversed_values.copy()
+    width = int(lengths[0])
+    if width and np.all(lengths == width):
+        return reversed_values.reshape(-1, width)[::-1].ravel()
+
+    data = reversed_values.tobytes()
+    size = values.itemsize
+    starts = ((total - offsets[1:]) * size).tolist()
+    stops = ((total - offsets[:-1]) * size).tolist()
+    joined = b''.join(map(data.__getitem__, map(slice, starts, stops)))
+    return np.frombuffer(joined, dtype=values.dtype)
+
+
+def fastq_line_roles(data):
+    """
+    Line boundaries and per-byte line roles of a block of FASTQ records.
+
+    Line ends come from one scan for newlines. Every byte is then tagged
+    with its line's role by np.repeat: 0 header, 1 sequence, 2 '+' line,
+    3 quality, and 4 for the newline and any carriage return before it.
+    Masks such as data[role == 1] then pull out all sequence bytes in one
+    pass.
+
+    Args:
+        data (numpy.ndarray): uint8 view of the block
+
+    Returns:
+        tuple: (starts, ends, content_ends, role) where ends are the
+            newline positions and content_ends exclude a trailing carriage
+            return
+    """
+    ends = np.flatnonzero(data == 10)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    content_ends = ends - ((ends > starts) & (data[ends - 1] == 13))
+    role = np.repeat((np.arange(len(ends)) % 4).astype(np.uint8), ends - starts + 1)
+    role[ends] = 4
+    role[content_ends] = 4      # '\r' before '\n' (a no-op on '\n' itself otherwise)
+    return starts, ends, content_ends, role
+
+
+def segment_sums(values, offsets):
+    """
+    Sum values inside each [offsets[i], offsets[i + 1]) segment.
+
+    Uses np.add.reduceat with a zero sentinel appended so empty and
+    trailing segments sum to 0 instead of borrowing a neighbour's value.
+    Short segments of 0/1 values are accumulated in uint16, which is
+    several times faster than int64 for read-sized segments.
+    """
+    lengths = np.diff(offsets)
+    if len(lengths) == 0:
+        return np.zeros(0, dtype=np.int64)
+    padded = np.append(values, np.zeros(1, dtype=values.dtype))
+    if values.dtype == np.uint8 and lengths.max() * 255 < 2 ** 16:
+        sums = np.add.reduceat(padded, offsets[:-1], dtype=np.uint16)
+    else:
+        sums = np.add.reduceat(padded, offsets[:-1], dtype=np.int64)
+    sums = sums.astype(np.int64)
+    sums[lengths == 0] = 0
+    return sums
@@ -0,0 +1,329 @@
+"""
+Streaming FASTQ integrity validation for single and paired-end files.
+
+Checks every record in one pass over the (optionally gzip/BGZF) file:
+'@' header and '+' separator lines, sequence/quality length agreement,
+sequence alphabet, Phred quality range, truncation and decompression
+errors, and for paired files that R1/R2 read IDs stay in step.
+
+Usage:
+    python -m gene_toolkit.utils.fastq_validator data/*.fastq.gz --json report.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ..io.compression import is_bgzf, is_gzip
+from ..io.readers import iter_fastq_blocks
+from .encoding import fastq_line_roles
+from .validators import ALPHABETS, _LOOKUP_TABLES, _alphabet_bytes
+
+_PAIR_NAME = re.compile(r'^(.*?)([._](?:R)?)([12])((?:[._]\d+)?\.f(?:ast)?q(?:\.b?gz)?)$')
+
+
+def _new_report(filename):
+    compression = 'bgzf' if is_bgzf(filename) else 'gzip' if is_gzip(filename) else None
+    return {'file': filename, 'compression': compression, 'valid': True, 'records': 0,
+            'bases': 0, 'min_length': None, 'max_length': None, 'quality_min': None,
+            'quality_max': None, 'error_count': 0, 'errors': []}
+
+
+def _add_errors(report, records, first_record, message, max_errors):
+    """Record one error per offending record (0-based within the block)."""
+    if not len(records):
+        return
+    report['valid'] = False
+    report['error_count'] += len(records)
+    room = max_errors - len(report['errors'])
+    for record in records[:max(room, 0)].tolist():
+        number = first_record + record + 1
+        # 'line' is the record's header line
+        report['errors'].append({'record': number, 'line': 4 * (number - 1) + 1, 'error': message})
+
+
+def _update_range(report, low_key, high_key, low, high):
+    if report[low_key] is None or low < report[low_key]:
+        report[low_key] = low
+    if report[high_key] is None or high > report[high_key]:
+        report[high_key] = high
+
+
+def _check_block(buffer, report, table, allowed, quality_low, quality_high, phred_offset,
+                 max_errors, want_ids):
+    """
+    Validate a block of whole records with array operations.
+
+    Each byte is tagged with its line's role (header, sequence, '+',
+    quality) by fastq_line_roles, so alphabet and quality-range checks are
+    single masked lookups.
+
+    Returns:
+        list: Normalised read IDs (bytes) when want_ids, otherwise None
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    starts, ends, content_ends, role = fastq_line_roles(data)
+    lengths = content_ends - starts
+    first = report['records']
+    n = len(ends) // 4
+
+    _add_errors(report, np.flatnonzero(data[starts[0::4]] != ord('@')), first,
+                "header line does not start with '@'", max_errors)
+    _add_errors(report, np.flatnonzero(data[starts[2::4]] != ord('+')), first,
+                "separator line does not start with '+'", max_errors)
+    sequence_lengths, quality_lengths = lengths[1::4], lengths[3::4]
+    _add_errors(report, np.flatnonzero(sequence_lengths != quality_lengths), first,
+                "sequence and quality lengths differ", max_errors)
+
+    def record_of(positions):
+        return np.unique(np.searchsorted(ends, positions) // 4)
+
+    # Locate offending bytes only when a cheap whole-block check fails
+    if data[role == 1].tobytes().translate(None, allowed):
+        bad_bases = np.flatnonzero((role == 1) & ~table[data])
+        _add_errors(report, record_of(bad_bases), first,
+                    "sequence contains characters outside the alphabet", max_errors)
+    quality = data[role == 3]
+    if len(quality):
+        low, high = int(quality.min()), int(quality.max())
+        if low < quality_low or high > quality_high:
+            out_of_range = (data < quality_low) | (data > quality_high)
+            bad_quality = np.flatnonzero((role == 3) & out_of_range)
+            _add_errors(report, record_of(bad_quality), first,
+                        "quality outside the allowed Phred range", max_errors)
+        _update_range(report, 'quality_min', 'quality_max',
+                      low - phred_offset, high - phred_offset)
+
+    if n:
+        _update_range(report, 'min_length', 'max_length',
+                      int(sequence_lengths.min()), int(sequence_lengths.max()))
+    report['records'] += n
+    report['bases'] += int(sequence_lengths.sum())
+
+    if not want_ids:
+        return None
+    # ID = header up to the first space/tab, without a trailing /1 or /2
+    header_starts, header_ends = starts[0::4] + 1, content_ends[0::4]
+    blanks = np.flatnonzero((data == 32) | (data == 9))
+    next_blank = np.searchsorted(blanks, header_starts)
+    blank_positions = np.append(blanks, len(data))[next_blank]
+    id_ends = np.minimum(blank_positions, header_ends)
+    mate_suffix = ((id_ends - header_starts >= 2) & (data[id_ends - 2] == ord('/'))
+                   & np.isin(data[id_ends - 1], (ord('1'), ord('2'))))
+    id_ends = id_ends - 2 * mate_suffix
+    return [buffer[a:b] for a, b in zip(header_starts.tolist(), id_ends.tolist())]
+
+
+def _check_stream(filename, report, alphabet='dna_n', phred_offset=33, min_quality=0,
+                  max_quality=93, max_errors=20, chunk_size=1 << 24, want_ids=False):
+    """
+    Validate a file block by block, updating report in place.
+
+    Blocks of whole four-line records come from iter_fastq_blocks; an
+    incomplete final record is reported as truncation. Yields the read IDs
+    of each block when want_ids (for pair checking), otherwise None.
+    """
+    allowed = _alphabet_bytes(alphabet)     # raises ValueError for unknown alphabets
+    table = _LOOKUP_TABLES[alphabet]
+    quality_low, quality_high = phred_offset + min_quality, phred_offset + max_quality
+    try:
+        for block in iter_fastq_blocks(filename, chunk_size, partial=True):
+            lines = block.count(b'\n') % 4
+            if lines:
+                _add_errors(report, np.array([0]), report['records'],
+                            f"file ends inside a record ({lines} of 4 lines)", max_errors)
+                return
+            yield _check_block(block, report, table, allowed, quality_low, quality_high,
+                               phred_offset, max_errors, want_ids)
+    except (OSError, EOFError, zlib.error) as error:
+        report['valid'] = False
+        report['error_count'] += 1
+        report['errors'].append({'record': report['records'] + 1, 'line': None,
+                                 'error': f"read failed: {error}"})
+
+
+def validate_fastq(filename, alphabet='dna_n', phred_offset=33, min_quality=0, max_quality=93,
+                   max_errors=20, chunk_size=1 << 24):
+    """
+    Validate one FASTQ file in a single streaming pass.
+
+    Args:
+        filename (str): FASTQ file (plain, gzip or BGZF)
+        alphabet (str): Allowed sequence letters, a validators.ALPHABETS
+            key (default: 'dna_n')
+        phred_offset (int): Quality encoding offset (default: 33)
+        min_quality, max_quality (int): Allowed Phred range (default: 0-93)
+        max_errors (int): Errors listed in the report; all are counted
+            (default: 20)
+        chunk_size (int): Bytes read per block (default: 16 MB)
+
+    Returns:
+        dict: JSON-serialisable report with 'valid', 'records', 'bases',
+            length and quality ranges, 'error_count' and 'errors'
+            (record number, line number and message)
+    """
+    report = _new_report(filename)
+    for _ in _check_stream(filename, report, alphabet, phred_offset, min_quality, max_quality,
+                           max_errors, chunk_size):
+        pass
+    return report
+
+
+def validate_fastq_pair(r1, r2, max_errors=20, **options):
+    """
+    Validate paired R1/R2 files together and check that read IDs match.
+
+    Both files are streamed in lockstep, so memory stays bounded by one
+    block of IDs. IDs are compared up to the first space, ignoring a
+    trailing /1 or /2.
+
+    Args:
+        r1, r2 (str): Mate files
+        max_errors (int): Errors listed per file and for the pairing
+        **options: Passed on as in validate_fastq
+
+    Returns:
+        dict: 'valid', 'r1' and 'r2' file reports, 'pairs_checked',
+            'id_mismatches' and 'errors' for the pairing
+    """
+    reports = [_new_report(r1), _new_report(r2)]
+    streams = [_check_stream(name, report, max_errors=max_errors, want_ids=True, **options)
+               for name, report in zip((r1, r2), reports)]
+    pending = [[], []]
+    done = [False, False]
+    checked = mismatches = 0
+    errors = []
+
+    while not all(done):
+        # Read from whichever mate is behind
+        mate = 0 if (len(pending[0]) <= len(pending[1]) and not done[0]) or done[1] else 1
+        ids = next(streams[mate], StopIteration)
+        if ids is StopIteration:
+            done[mate] = True
+        else:
+            pending[mate].extend(ids)
+        count = min(len(pending[0]), len(pending[1]))
+        for index, (id1, id2) in enumerate(zip(pending[0][:count], pending[1][:count])):
+            if id1 != id2:
+                mismatches += 1
+                if len(errors) < max_errors:
+                    errors.append({'record': checked + index + 1,
+                                   'error': f"read IDs differ: {id1.decode('ascii', 'replace')}"
+                                            f" != {id2.decode('ascii', 'replace')}"})
+        checked += count
+        del pending[0][:count], pending[1][:count]
+
+    if reports[0]['records'] != reports[1]['records']:
+        counts = f"{reports[0]['records']} != {reports[1]['records']}"
+        errors.append({'record': None, 'error': f"record counts differ: {counts}"})
+    return {'valid': reports[0]['valid'] and reports[1]['valid'] and not errors,
+            'r1': reports[0], 'r2': reports[1], 'pairs_checked': checked,
+            'id_mismatches': mismatches, 'errors': errors}
+
+
+def pair_files(filenames):
+    """
+    Group file names into R1/R2 pairs by the usual _1/_2 and _R1/_R2 naming.
+
+    Returns:
+        tuple: (pairs, singles) where pairs is a list of (r1, r2) tuples
+    """
+    mates = {}
+    for filename in filenames:
+        match = _PAIR_NAME.match(filename)
+        if match:
+            prefix, separator, mate, suffix = match.groups()
+            mates.setdefault((prefix, separator, suffix), {})[mate] = filename
+    pairs, paired = [], set()
+    for group in mates.values():
+        if set(group) == {'1', '2'}:
+            pairs.append((group['1'], group['2']))
+            paired.update(group.values())
+    return pairs, [filename for filename in filenames if filename not in paired]
+
+
+def _validate_job(job, options):
+    if len(job) == 2:
+        return validate_fastq_pair(*job, **options)
+    return validate_fastq(job[0], **options)
+
+
+def validate_fastq_files(filenames, paired=True, workers=None, **options):
+    """
+    Validate many FASTQ files in parallel worker processes.
+
+    Each single file or R1/R2 pair is one job, so a pair is always read
+    in lockstep by the same worker.
+
+    Args:
+        filenames (list): FASTQ files
+        paired (bool): Detect R1/R2 pairs by name and check their read IDs
+            (default: True)
+        workers (int): Worker processes (default: os.cpu_count())
+        **options: Passed on as in validate_fastq
+
+    Returns:
+        dict: 'valid' (all files and pairs), 'files' (one report per
+            unpaired file) and 'pairs' (one report per pair)
+    """
+    pairs, singles = pair_files(filenames) if paired else ([], list(filenames))
+    jobs = pairs + [(filename,) for filename in singles]
+    workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+    if workers == 1:
+        results = [_validate_job(job, options) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_validate_job, job, options) for job in jobs]
+            results = [future.result() for future in futures]
+    pair_reports, file_reports = results[:len(pairs)], results[len(pairs):]
+    return {'valid': all(result['valid'] for result in results),
+            'files': file_reports, 'pairs': pair_reports}
+
+
+def _summary_lines(report):
+    def line(file_report):
+        status = 'OK       ' if file_report['valid'] else 'CORRUPTED'
+        first = file_report['errors'][0]['error'] if file_report['errors'] else ''
+        records = file_report['records']
+        return f"{status} {file_report['file']} ({records} records) {first}".rstrip()
+
+    for pair in report['pairs']:
+        yield line(pair['r1'])
+        yield line(pair['r2'])
+        if pair['errors']:
+            yield (f"UNPAIRED  {pair['r1']['file']} / {pair['r2']['file']}: "
+                   f"{pair['errors'][0]['error']}")
+    for file_report in report['files']:
+        yield line(file_report)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate FASTQ files (plain, gzip or BGZF)")
+    parser.add_argument('files', nargs='+', help="FASTQ files")
+    parser.add_argument('--json', metavar='PATH', help="write the full report as JSON")
+    parser.add_argument('--workers', type=int, help="worker processes")
+    parser.add_argument('--no-pairs', action='store_true', help="skip R1/R2 pairing checks")
+    parser.add_argument('--alphabet', default='dna_n', choices=sorted(ALPHABETS))
+    parser.add_argument('--phred-offset', type=int, default=33)
+    parser.add_argument('--max-quality', type=int, default=93)
+    args = parser.parse_args(argv)
+
+    report = validate_fastq_files(args.files, paired=not args.no_pairs, workers=args.workers,
+                                  alphabet=args.alphabet, phred_offset=args.phred_offset,
+                                  max_quality=args.max_quality)
+    for line in _summary_lines(report):
+        print(line)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0 if report['valid'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
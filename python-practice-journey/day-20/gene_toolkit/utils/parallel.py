@@ -0,0 +1,108 @@
+"""Process-pool execution of per-record functions over sharded files"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from ..io.compression import is_gzip
+from ..io.readers import detect_format, iter_fasta, iter_fastq
+
+
+def _next_record_start(f, offset, fmt, file_size):
+    """Byte offset of the first record starting at or after offset."""
+    if offset == 0:
+        return 0
+    f.seek(offset - 1)
+    if f.read(1) != b'\n':
+        f.readline()    # finish the partial line we landed in
+    while True:
+        position = f.tell()
+        line = f.readline()
+        if not line:
+            return file_size
+        if fmt == 'fasta' and line.startswith(b'>'):
+            return position
+        if fmt == 'fastq' and line.startswith(b'@'):
+            # A quality line may also start with '@'; a real header is
+            # followed by a sequence line and then a '+' line
+            f.readline()
+            separator = f.readline()
+            if separator.startswith(b'+'):
+                return position
+            f.seek(position + len(line))
+
+
+def shard_ranges(filename, n_shards, fmt=None):
+    """
+    Split a FASTA/FASTQ file into byte ranges aligned to record starts.
+
+    Args:
+        filename (str): Path to FASTA or FASTQ file
+        n_shards (int): Number of roughly equal-sized shards wanted
+        fmt (str): 'fasta' or 'fastq' (default: detect from the file)
+
+    Returns:
+        list: (start, end) byte offsets; empty shards are dropped
+    """
+    if is_gzip(filename):
+        raise ValueError("Byte-range sharding needs an uncompressed file")
+    fmt = fmt or detect_format(filename)
+    file_size = os.path.getsize(filename)
+    with open(filename, 'rb') as f:
+        cuts = sorted({_next_record_start(f, file_size * i // n_shards, fmt, file_size)
+                       for i in range(n_shards)})
+    cuts.append(file_size)
+    return [(start, end) for start, end in zip(cuts, cuts[1:]) if start < end]
+
+
+def _run_shard(function, filename, fmt, start, end, pass_record):
+    """Worker: read one shard itself and apply function to every record."""
+    reader = iter_fasta if fmt == 'fasta' else iter_fastq
+    results = []
+    for record in reader(filename, start=start, end=end):
+        value = function(record) if pass_record else function(record[2])
+        results.append((record[0], value))
+    return results
+
+
+def map_records(function, filename, fmt=None, workers=None, shards_per_worker=4,
+                pass_record=False):
+    """
+    Apply a function to every record of a FASTA/FASTQ file on all cores.
+
+    The file is cut into byte ranges at record boundaries and each worker
+    process opens and parses its own ranges, so only the small results
+    travel between processes. Results come back in file order.
+    Compressed files cannot be split by byte offset and run as a single
+    shard.
+
+    Args:
+        function (callable): Module-level (picklable) function called with
+            each sequence, or with the whole record tuple if pass_record
+        filename (str): Path to FASTA or FASTQ file
+        fmt (str): 'fasta' or 'fastq' (default: detect from the file)
+        workers (int): Worker processes (default: os.cpu_count())
+        shards_per_worker (int): Shards per worker for load balancing
+            (default: 4)
+        pass_record (bool): Call function(record) instead of
+            function(sequence) (default: False)
+
+    Returns:
+        list: (record_id, result) tuples in file order
+
+    Usage:
+        results = map_records(gc_content, 'genome.fa', workers=32)
+    """
+    fmt = fmt or detect_format(filename)
+    workers = workers or os.cpu_count() or 1
+    if is_gzip(filename):
+        ranges = [(0, None)]
+    else:
+        ranges = shard_ranges(filename, workers * shards_per_worker, fmt)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_shard, function, filename, fmt, start, end, pass_record)
+                   for start, end in ranges]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+    return results
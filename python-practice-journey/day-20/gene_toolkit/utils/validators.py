@@ -0,0 +1,110 @@
+"""Validation utilities"""
+
+import numpy as np
+
+from .encoding import as_buffer
+
+# Allowed letters per alphabet; lowercase is always accepted as well
+ALPHABETS = {
+    'dna': 'ACGT',
+    'dna_n': 'ACGTN',
+    'iupac': 'ACGTURYSWKMBDHVN',
+    'rna': 'ACGUN',
+    'protein': 'ACDEFGHIKLMNPQRSTVWYBZXJUO*',
+}
+
+_DELETE_TABLES = {}
+_LOOKUP_TABLES = {}
+for _name, _letters in ALPHABETS.items():
+    _DELETE_TABLES[_name] = (_letters + _letters.lower()).encode('ascii')
+    _LOOKUP_TABLES[_name] = np.zeros(256, dtype=bool)
+    _LOOKUP_TABLES[_name][list(_DELETE_TABLES[_name])] = True
+
+
+def _alphabet_bytes(alphabet):
+    try:
+        return _DELETE_TABLES[alphabet]
+    except KeyError:
+        raise ValueError(f"Unknown alphabet {alphabet!r}; choose from {sorted(ALPHABETS)}") from None
+
+
+def _as_bytes(sequence):
+    if isinstance(sequence, str):
+        return sequence.encode('ascii', errors='replace')
+    return sequence
+
+
+def find_invalid(sequence, alphabet='dna'):
+    """
+    Locate the first character that is not in the alphabet.
+
+    One bytes.translate(None, delete=alphabet) pass leaves only invalid
+    characters; the first of them is then found with bytes.find.
+
+    Args:
+        sequence (str or bytes): Sequence to check
+        alphabet (str): 'dna', 'dna_n', 'iupac', 'rna' or 'protein'
+            (default: 'dna')
+
+    Returns:
+        tuple: (offset, character) of the first invalid character, or
+            None if the whole sequence is valid
+    """
+    data = _as_bytes(sequence)
+    invalid = data.translate(None, _alphabet_bytes(alphabet))
+    if not invalid:
+        return None
+    offset = data.find(invalid[:1])
+    character = sequence[offset] if isinstance(sequence, str) else chr(invalid[0])
+    return offset, character
+
+
+def validate_dna(sequence, alphabet='dna'):
+    """Check if sequence contains only valid bases for the alphabet (default: ACGT)"""
+    return not _as_bytes(sequence).translate(None, _alphabet_bytes(alphabet))
+
+
+def check_sequence(sequence, alphabet='dna'):
+    """
+    Raise ValueError naming the first invalid character, if any.
+
+    Args:
+        sequence (str or bytes): Sequence to check
+        alphabet (str): Alphabet name, see find_invalid (default: 'dna')
+    """
+    problem = find_invalid(sequence, alphabet)
+    if problem is not None:
+        offset, character = problem
+        raise ValueError(f"Invalid {alphabet} sequence: {character!r} at position {offset}")
+
+
+def validate_batch(sequences, offsets=None, alphabet='dna'):
+    """
+    Validate many sequences in one call.
+
+    Every byte of the packed batch goes through a 256-entry boolean lookup
+    table once; the first bad position of each sequence is then found
+    with a single searchsorted.
+
+    Args:
+        sequences (list or buffer): Sequences, or one concatenated buffer
+            when offsets is given
+        offsets (array): n + 1 boundaries into the buffer (default: None)
+        alphabet (str): Alphabet name, see find_invalid (default: 'dna')
+
+    Returns:
+        numpy.ndarray: int64 array with the offset of the first invalid
+            character within each sequence, or -1 where it is valid
+    """
+    _alphabet_bytes(alphabet)
+    buffer, offsets = as_buffer(sequences, offsets)
+    bad = np.flatnonzero(~_LOOKUP_TABLES[alphabet][buffer])
+
+    first_bad = np.full(len(offsets) - 1, -1, dtype=np.int64)
+    if len(bad) == 0:
+        return first_bad
+    candidate = np.searchsorted(bad, offsets[:-1])
+    has_bad = candidate < len(bad)
+    has_bad[has_bad] = bad[candidate[has_bad]] < offsets[1:][has_bad]
+    first_bad[has_bad] = bad[candidate[has_bad]] - offsets[:-1][has_bad]
+    return first_bad